@@ -4,12 +4,149 @@ This module analyzes a codebase to identify file types, dependencies,
 and existing configurations to inform the generation of pre-commit hooks.
 """
 
+import hashlib
+import json
 import os
 import re
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, Iterator, List, Mapping, Optional, Set, Tuple, cast
 
+from gemini_precommit import __version__
 from gemini_precommit.logging import get_logger
+from gemini_precommit.utils import atomic_write_text, get_cache_dir, is_cache_disabled
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
+
+logger = get_logger("analyzer")
+
+# Directories that are never descended into when walking the repository.
+# Hidden directories (starting with "."), such as .git, .venv and .tox, are
+# rejected by a name.startswith(".") check before this set is consulted.
+_SKIP_DIRS = frozenset({"venv", "env", "node_modules", "__pycache__", "dist", "build"})
+
+# Patterns used when parsing dependency files. The bytes patterns are matched
+# against raw file contents so that only the captured names need decoding.
+_REQ_NAME_RE = re.compile(r"^([a-zA-Z0-9_.-]+)")
+_REQ_NAME_RE_B = re.compile(rb"^([a-zA-Z0-9_.-]+)")
+_INSTALL_REQUIRES_RE_B = re.compile(rb"install_requires\s*=\s*\[(?P<deps>.*?)\]", re.DOTALL)
+_QUOTED_PKG_RE_B = re.compile(rb"['\"]([a-zA-Z0-9_.-]+)['\"]")
+_PIPFILE_PACKAGES_RE_B = re.compile(rb"\[packages\](?P<section>.*?)(\[|\Z)", re.DOTALL)
+_PIPFILE_PKG_LINE_RE_B = re.compile(rb"^\s*[\"']?([a-zA-Z0-9_.-]+)[\"']?\s*=", re.MULTILINE)
+
+# Paths below the repository root that the analyzer reads, included in the
+# analysis cache fingerprint alongside the root entries
+_FINGERPRINT_NESTED_PATHS = (".github/workflows", ".circleci/config.yml")
+
+# Tools whose configuration may live in a [tool.<name>] table of pyproject.toml
+_PYPROJECT_TOOLS = frozenset({"black", "isort", "mypy", "flake8", "pylint"})
+
+# Mapping from file extension to programming language, built once at import
+_EXT_TO_LANG: Mapping[str, str] = MappingProxyType(
+    {
+        "py": "python",
+        "js": "javascript",
+        "ts": "typescript",
+        "jsx": "javascript",
+        "tsx": "typescript",
+        "rb": "ruby",
+        "go": "go",
+        "java": "java",
+        "kt": "kotlin",
+        "rs": "rust",
+        "c": "c",
+        "cpp": "c++",
+        "h": "c",
+        "hpp": "c++",
+        "cs": "c#",
+        "php": "php",
+        "swift": "swift",
+        "scala": "scala",
+        "clj": "clojure",
+        "ex": "elixir",
+        "exs": "elixir",
+        "hs": "haskell",
+        "sh": "shell",
+        "bash": "shell",
+        "zsh": "shell",
+        "fish": "shell",
+        "ps1": "powershell",
+        "bat": "batch",
+        "cmd": "batch",
+        "sql": "sql",
+        "r": "r",
+        "dart": "dart",
+        "lua": "lua",
+        "pl": "perl",
+        "pm": "perl",
+        "groovy": "groovy",
+        "yaml": "yaml",
+        "yml": "yaml",
+        "json": "json",
+        "xml": "xml",
+        "html": "html",
+        "css": "css",
+        "scss": "scss",
+        "sass": "sass",
+        "less": "less",
+        "md": "markdown",
+        "markdown": "markdown",
+        "rst": "restructuredtext",
+        "toml": "toml",
+        "ini": "ini",
+        "cfg": "ini",
+        "conf": "ini",
+        "dockerfile": "dockerfile",
+        "tf": "terraform",
+        "hcl": "hcl",
+    }
+)
+
+# Inverse of _EXT_TO_LANG: the set of extensions belonging to each language
+_LANG_TO_EXTS: Mapping[str, FrozenSet[str]] = MappingProxyType(
+    {
+        lang: frozenset(ext for ext, ext_lang in _EXT_TO_LANG.items() if ext_lang == lang)
+        for lang in set(_EXT_TO_LANG.values())
+    }
+)
+
+
+def _iter_file_names(root: str) -> Iterator[str]:
+    """Yield the names of all non-hidden files below root.
+
+    Uses os.scandir directly so that the file type of each entry comes from the
+    directory listing itself rather than a separate stat call. Hidden directories
+    and those in _SKIP_DIRS are never descended into.
+
+    Args:
+        root: Directory to start walking from.
+
+    Yields:
+        The base name of each file found.
+    """
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    name = entry.name
+                    if name.startswith("."):
+                        continue
+                    if entry.is_dir():
+                        # Like os.walk, do not follow symlinked directories
+                        if name not in _SKIP_DIRS and not entry.is_symlink():
+                            stack.append(entry.path)
+                    else:
+                        yield name
+        except OSError:
+            # Ignore unreadable directories, as os.walk does by default
+            continue
 
 
 class CodebaseAnalyzer:
@@ -21,14 +158,15 @@ class CodebaseAnalyzer:
         Args:
             repo_path: Path to the repository root. Defaults to current directory.
         """
-        self.logger = get_logger("analyzer")
         self.repo_path = Path(repo_path).resolve()
-        self.logger.info(f"Initializing analyzer for repository at {self.repo_path}")
+        logger.info(f"Initializing analyzer for repository at {self.repo_path}")
         self.file_extensions: Set[str] = set()
         self.languages: Set[str] = set()
         self.python_dependencies: Set[str] = set()
         self.existing_configs: Dict[str, Path] = {}
         self.ci_workflows: List[Path] = []
+        self._root_entries: Optional[Dict[str, os.DirEntry]] = None
+        self._pyproject_data: Optional[Dict[str, Any]] = None
 
     def analyze(self) -> Dict[str, object]:
         """Analyze the codebase and return the results.
@@ -36,148 +174,109 @@ class CodebaseAnalyzer:
         Returns:
             A dictionary containing analysis results.
         """
-        self.logger.info("Starting codebase analysis")
-
-        self.logger.debug("Finding file extensions")
-        self._find_file_extensions()
-
-        self.logger.debug("Detecting languages")
+        logger.info("Starting codebase analysis")
+
+        # List the repository root and parse pyproject.toml once up front; the
+        # steps below share them instead of each probing and reading the files
+        self._get_root_entries()
+        self._load_pyproject()
+
+        # These steps are independent and mostly I/O-bound, so run them
+        # concurrently. Each step writes only to its own attributes, so no
+        # locking is needed.
+        logger.debug(
+            "Finding file extensions, Python dependencies, "
+            "existing configurations and CI/CD workflows"
+        )
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [
+                executor.submit(self._find_file_extensions),
+                executor.submit(self._find_python_dependencies),
+                executor.submit(self._find_existing_configs),
+                executor.submit(self._find_ci_workflows),
+            ]
+            for future in as_completed(futures):
+                future.result()  # Propagate any exception raised by a step
+
+        # Language detection depends on the file extensions found above
+        logger.debug("Detecting languages")
         self._detect_languages()
 
-        self.logger.debug("Finding Python dependencies")
-        self._find_python_dependencies()
-
-        self.logger.debug("Finding existing configurations")
-        self._find_existing_configs()
-
-        self.logger.debug("Finding CI/CD workflows")
-        self._find_ci_workflows()
-
         results = {
-            "file_extensions": sorted(list(self.file_extensions)),
-            "languages": sorted(list(self.languages)),
-            "python_dependencies": sorted(list(self.python_dependencies)),
+            "file_extensions": sorted(self.file_extensions),
+            "languages": sorted(self.languages),
+            "python_dependencies": sorted(self.python_dependencies),
             "existing_configs": {k: str(v) for k, v in self.existing_configs.items()},
             "ci_workflows": [str(p) for p in self.ci_workflows],
         }
 
-        self.logger.info(f"Analysis complete. Found {len(self.file_extensions)} file extensions, "
-                      f"{len(self.languages)} languages, {len(self.python_dependencies)} Python dependencies, "
-                      f"{len(self.existing_configs)} existing configs, and {len(self.ci_workflows)} CI workflows")
-        self.logger.debug(f"Analysis results: {results}")
+        logger.info(
+            f"Analysis complete. Found {len(self.file_extensions)} file extensions, "
+            f"{len(self.languages)} languages, "
+            f"{len(self.python_dependencies)} Python dependencies, "
+            f"{len(self.existing_configs)} existing configs, "
+            f"and {len(self.ci_workflows)} CI workflows"
+        )
+        logger.debug("Analysis results: %s", results)
 
         return results
 
-    def _find_file_extensions(self) -> None:
-        """Find all file extensions in the repository."""
-        self.logger.trace(f"Walking directory tree starting at {self.repo_path}")
-        for root, _, files in os.walk(self.repo_path):
-            # Skip hidden directories and virtual environments
-            if any(
-                part.startswith(".")
-                or part in ("venv", ".venv", "env", "node_modules", "__pycache__")
-                for part in Path(root).parts
-            ):
-                self.logger.trace(f"Skipping directory {root}")
-                continue
+    def _get_root_entries(self) -> Dict[str, os.DirEntry]:
+        """Return the entries in the repository root, keyed by name.
+
+        The root directory is scanned on first use and the result is reused
+        for all subsequent lookups.
 
-            self.logger.trace(f"Processing {len(files)} files in {root}")
-            for file in files:
-                # Skip hidden files
-                if file.startswith("."):
-                    self.logger.trace(f"Skipping hidden file {file}")
-                    continue
+        Returns:
+            A dictionary mapping entry names to their directory entries.
+        """
+        if self._root_entries is None:
+            try:
+                with os.scandir(self.repo_path) as it:
+                    self._root_entries = {entry.name: entry for entry in it}
+            except OSError:
+                self._root_entries = {}
+        return self._root_entries
 
-                ext = os.path.splitext(file)[1].lower()
-                if ext:
-                    self.logger.trace(f"Found file extension: {ext[1:]} in file {file}")
-                    self.file_extensions.add(ext[1:])  # Remove the leading dot
+    def _find_file_extensions(self) -> None:
+        """Find all file extensions in the repository."""
+        logger.trace("Walking directory tree starting at %s", self.repo_path)
+        # Collect into a local set and merge once rather than adding per file
+        exts = {
+            name.rpartition(".")[2].lower()
+            for name in _iter_file_names(str(self.repo_path))
+            if "." in name
+        }
+        exts.discard("")  # Names ending in a dot have no extension
+        self.file_extensions.update(exts)
+        logger.trace("Found %d distinct file extensions", len(exts))
 
     def _detect_languages(self) -> None:
         """Detect programming languages used in the repository."""
-        extension_to_language = {
-            "py": "python",
-            "js": "javascript",
-            "ts": "typescript",
-            "jsx": "javascript",
-            "tsx": "typescript",
-            "rb": "ruby",
-            "go": "go",
-            "java": "java",
-            "kt": "kotlin",
-            "rs": "rust",
-            "c": "c",
-            "cpp": "c++",
-            "h": "c",
-            "hpp": "c++",
-            "cs": "c#",
-            "php": "php",
-            "swift": "swift",
-            "scala": "scala",
-            "clj": "clojure",
-            "ex": "elixir",
-            "exs": "elixir",
-            "hs": "haskell",
-            "sh": "shell",
-            "bash": "shell",
-            "zsh": "shell",
-            "fish": "shell",
-            "ps1": "powershell",
-            "bat": "batch",
-            "cmd": "batch",
-            "sql": "sql",
-            "r": "r",
-            "dart": "dart",
-            "lua": "lua",
-            "pl": "perl",
-            "pm": "perl",
-            "groovy": "groovy",
-            "yaml": "yaml",
-            "yml": "yaml",
-            "json": "json",
-            "xml": "xml",
-            "html": "html",
-            "css": "css",
-            "scss": "scss",
-            "sass": "sass",
-            "less": "less",
-            "md": "markdown",
-            "markdown": "markdown",
-            "rst": "restructuredtext",
-            "toml": "toml",
-            "ini": "ini",
-            "cfg": "ini",
-            "conf": "ini",
-            "dockerfile": "dockerfile",
-            "tf": "terraform",
-            "hcl": "hcl",
+        file_extensions = self.file_extensions
+        self.languages = {
+            lang for lang, exts in _LANG_TO_EXTS.items() if not exts.isdisjoint(file_extensions)
         }
 
-        for ext in self.file_extensions:
-            if ext in extension_to_language:
-                self.languages.add(extension_to_language[ext])
-
     def _find_python_dependencies(self) -> None:
         """Find Python dependencies in the repository."""
+        root_entries = self._get_root_entries()
+
         # Check requirements.txt
-        requirements_file = self.repo_path / "requirements.txt"
-        if requirements_file.exists():
-            self._parse_requirements_txt(requirements_file)
+        if "requirements.txt" in root_entries:
+            self._parse_requirements_txt(self.repo_path / "requirements.txt")
 
         # Check setup.py
-        setup_py = self.repo_path / "setup.py"
-        if setup_py.exists():
-            self._parse_setup_py(setup_py)
+        if "setup.py" in root_entries:
+            self._parse_setup_py(self.repo_path / "setup.py")
 
         # Check pyproject.toml
-        pyproject_toml = self.repo_path / "pyproject.toml"
-        if pyproject_toml.exists():
-            self._parse_pyproject_toml(pyproject_toml)
+        if "pyproject.toml" in root_entries:
+            self._parse_pyproject_toml()
 
         # Check Pipfile
-        pipfile = self.repo_path / "Pipfile"
-        if pipfile.exists():
-            self._parse_pipfile(pipfile)
+        if "Pipfile" in root_entries:
+            self._parse_pipfile(self.repo_path / "Pipfile")
 
     def _parse_requirements_txt(self, file_path: Path) -> None:
         """Parse requirements.txt file to extract dependencies.
@@ -186,19 +285,20 @@ class CodebaseAnalyzer:
             file_path: Path to the requirements.txt file.
         """
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    # Skip comments and empty lines
-                    if not line or line.startswith("#"):
-                        continue
-                    # Extract package name (ignore version specifiers)
-                    match = re.match(r"^([a-zA-Z0-9_.-]+)", line)
-                    if match:
-                        self.python_dependencies.add(match.group(1).lower())
-        except Exception:
-            # Silently fail if we can't parse the file
-            pass
+            data = file_path.read_bytes()
+        except OSError as e:
+            logger.debug(f"Failed to read {file_path}: {e}")
+            return
+
+        for line in data.splitlines():
+            line = line.strip()
+            # Skip comments and empty lines
+            if not line or line.startswith(b"#"):
+                continue
+            # Extract package name (ignore version specifiers)
+            match = _REQ_NAME_RE_B.match(line)
+            if match:
+                self.python_dependencies.add(match.group(1).decode("ascii").lower())
 
     def _parse_setup_py(self, file_path: Path) -> None:
         """Parse setup.py file to extract dependencies.
@@ -207,65 +307,68 @@ class CodebaseAnalyzer:
             file_path: Path to the setup.py file.
         """
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-                # Look for install_requires list
-                match = re.search(r"install_requires\s*=\s*\[(.*?)\]", content, re.DOTALL)
-                if match:
-                    deps_str = match.group(1)
-                    # Extract package names from quotes
-                    for dep_match in re.finditer(r"['\"]([a-zA-Z0-9_.-]+)['\"]", deps_str):
-                        self.python_dependencies.add(dep_match.group(1).lower())
-        except Exception:
-            # Silently fail if we can't parse the file
-            pass
-
-    def _parse_pyproject_toml(self, file_path: Path) -> None:
-        """Parse pyproject.toml file to extract dependencies.
+            content = file_path.read_bytes()
+        except OSError as e:
+            logger.debug(f"Failed to read {file_path}: {e}")
+            return
 
-        Args:
-            file_path: Path to the pyproject.toml file.
+        # Look for install_requires list
+        match = _INSTALL_REQUIRES_RE_B.search(content)
+        if match:
+            deps_str = match.group("deps")
+            # Extract package names from quotes
+            for dep_match in _QUOTED_PKG_RE_B.finditer(deps_str):
+                self.python_dependencies.add(dep_match.group(1).decode("ascii").lower())
+
+    def _load_pyproject(self) -> Dict[str, Any]:
+        """Load and parse pyproject.toml from the repository root.
+
+        The file is parsed on first use and the result is reused by both the
+        dependency and the configuration detection.
+
+        Returns:
+            The parsed pyproject.toml data, or an empty dictionary if the file
+            does not exist or cannot be parsed.
         """
-        try:
-            import tomli
-
-            with open(file_path, "rb") as f:
-                data = tomli.load(f)
-                # Check for dependencies in different possible locations
-                deps = []
-                if "project" in data and "dependencies" in data["project"]:
-                    deps.extend(data["project"]["dependencies"])
-                elif "tool" in data:
-                    if "poetry" in data["tool"] and "dependencies" in data["tool"]["poetry"]:
-                        deps.extend(data["tool"]["poetry"]["dependencies"].keys())
-                    elif "pdm" in data["tool"] and "dependencies" in data["tool"]["pdm"]:
-                        deps.extend(data["tool"]["pdm"]["dependencies"])
-
-                for dep in deps:
-                    # Extract package name (ignore version specifiers)
-                    match = re.match(r"^([a-zA-Z0-9_.-]+)", dep)
-                    if match:
-                        self.python_dependencies.add(match.group(1).lower())
-        except ImportError:
-            # tomli not available, try a simple regex approach
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                    # Look for dependencies sections
-                    for section in ["dependencies", "tool.poetry.dependencies", "tool.pdm.dependencies"]:
-                        section_pattern = rf"{section}\s*=\s*\[(.*?)\]"
-                        match = re.search(section_pattern, content, re.DOTALL)
-                        if match:
-                            deps_str = match.group(1)
-                            # Extract package names from quotes
-                            for dep_match in re.finditer(r"['\"]([a-zA-Z0-9_.-]+)['\"]", deps_str):
-                                self.python_dependencies.add(dep_match.group(1).lower())
-            except Exception:
-                # Silently fail if we can't parse the file
-                pass
-        except Exception:
-            # Silently fail if we can't parse the file
-            pass
+        if self._pyproject_data is None:
+            self._pyproject_data = {}
+            if "pyproject.toml" in self._get_root_entries():
+                pyproject_path = self.repo_path / "pyproject.toml"
+                try:
+                    with open(pyproject_path, "rb") as f:
+                        self._pyproject_data = tomllib.load(f)
+                except (OSError, UnicodeDecodeError, tomllib.TOMLDecodeError) as e:
+                    logger.debug(f"Failed to parse {pyproject_path}: {e}")
+        return self._pyproject_data
+
+    def _parse_pyproject_toml(self) -> None:
+        """Parse pyproject.toml file to extract dependencies."""
+        data = self._load_pyproject()
+        project = data.get("project")
+        tool = data.get("tool")
+
+        # Check for dependencies in different possible locations. Poetry uses a
+        # table keyed by package name; iterating over it yields the names.
+        deps: Any = []
+        if isinstance(project, dict) and "dependencies" in project:
+            deps = project["dependencies"]
+        elif isinstance(tool, dict):
+            poetry = tool.get("poetry")
+            pdm = tool.get("pdm")
+            if isinstance(poetry, dict) and "dependencies" in poetry:
+                deps = poetry["dependencies"]
+            elif isinstance(pdm, dict) and "dependencies" in pdm:
+                deps = pdm["dependencies"]
+
+        if not isinstance(deps, (list, dict)):
+            logger.debug("Unexpected dependency layout in pyproject.toml")
+            return
+
+        for dep in deps:
+            # Extract package name (ignore version specifiers)
+            match = _REQ_NAME_RE.match(dep) if isinstance(dep, str) else None
+            if match:
+                self.python_dependencies.add(match.group(1).lower())
 
     def _parse_pipfile(self, file_path: Path) -> None:
         """Parse Pipfile to extract dependencies.
@@ -274,22 +377,17 @@ class CodebaseAnalyzer:
             file_path: Path to the Pipfile.
         """
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-                # Look for packages section
-                match = re.search(r"\[packages\](.*?)(\[|\Z)", content, re.DOTALL)
-                if match:
-                    packages_section = match.group(1)
-                    # Extract package names
-                    for line in packages_section.split("\n"):
-                        line = line.strip()
-                        if "=" in line:
-                            package = line.split("=")[0].strip()
-                            if package:
-                                self.python_dependencies.add(package.lower())
-        except Exception:
-            # Silently fail if we can't parse the file
-            pass
+            content = file_path.read_bytes()
+        except OSError as e:
+            logger.debug(f"Failed to read {file_path}: {e}")
+            return
+
+        # Look for packages section
+        match = _PIPFILE_PACKAGES_RE_B.search(content)
+        if match:
+            # Extract package names
+            for pkg_match in _PIPFILE_PKG_LINE_RE_B.finditer(match.group("section")):
+                self.python_dependencies.add(pkg_match.group(1).decode("ascii").lower())
 
     def _find_existing_configs(self) -> None:
         """Find existing configuration files in the repository."""
@@ -305,63 +403,209 @@ class CodebaseAnalyzer:
             "stylelint": ".stylelintrc",
         }
 
+        root_entries = self._get_root_entries()
         for config_name, filename in config_files.items():
-            config_path = self.repo_path / filename
-            if config_path.exists():
-                self.existing_configs[config_name] = config_path
+            if filename in root_entries:
+                self.existing_configs[config_name] = self.repo_path / filename
 
         # Check for pyproject.toml with tool configurations
-        pyproject_path = self.repo_path / "pyproject.toml"
-        if pyproject_path.exists():
-            try:
-                with open(pyproject_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                    for tool in ["black", "isort", "mypy", "flake8", "pylint"]:
-                        if f"tool.{tool}" in content:
-                            self.existing_configs[tool] = pyproject_path
-            except Exception:
-                # Silently fail if we can't read the file
-                pass
+        tools = self._load_pyproject().get("tool")
+        if isinstance(tools, dict):
+            pyproject_path = self.repo_path / "pyproject.toml"
+            for tool in _PYPROJECT_TOOLS.intersection(tools):
+                self.existing_configs[tool] = pyproject_path
 
     def _find_ci_workflows(self) -> None:
         """Find CI/CD workflow files in the repository."""
+        root_entries = self._get_root_entries()
+
         # GitHub Actions
-        github_workflows = self.repo_path / ".github" / "workflows"
-        if github_workflows.exists() and github_workflows.is_dir():
-            for file in github_workflows.glob("*.yml"):
-                self.ci_workflows.append(file)
-            for file in github_workflows.glob("*.yaml"):
-                self.ci_workflows.append(file)
+        if ".github" in root_entries:
+            github_workflows = self.repo_path / ".github" / "workflows"
+            try:
+                with os.scandir(github_workflows) as it:
+                    self.ci_workflows.extend(
+                        sorted(
+                            Path(entry.path)
+                            for entry in it
+                            if entry.name.endswith((".yml", ".yaml")) and entry.is_file()
+                        )
+                    )
+            except OSError:
+                # No workflows directory
+                pass
 
         # GitLab CI
-        gitlab_ci = self.repo_path / ".gitlab-ci.yml"
-        if gitlab_ci.exists():
-            self.ci_workflows.append(gitlab_ci)
+        if ".gitlab-ci.yml" in root_entries:
+            self.ci_workflows.append(self.repo_path / ".gitlab-ci.yml")
 
         # CircleCI
-        circleci = self.repo_path / ".circleci" / "config.yml"
-        if circleci.exists():
-            self.ci_workflows.append(circleci)
+        if ".circleci" in root_entries:
+            circleci = self.repo_path / ".circleci" / "config.yml"
+            if circleci.exists():
+                self.ci_workflows.append(circleci)
 
         # Travis CI
-        travis = self.repo_path / ".travis.yml"
-        if travis.exists():
-            self.ci_workflows.append(travis)
+        if ".travis.yml" in root_entries:
+            self.ci_workflows.append(self.repo_path / ".travis.yml")
 
         # Azure Pipelines
-        azure = self.repo_path / "azure-pipelines.yml"
-        if azure.exists():
-            self.ci_workflows.append(azure)
+        if "azure-pipelines.yml" in root_entries:
+            self.ci_workflows.append(self.repo_path / "azure-pipelines.yml")
+
+
+def _stat_key(path: str) -> str:
+    """Describe the modification time and size of a path for a fingerprint.
+
+    Args:
+        path: The path to describe.
+
+    Returns:
+        The modification time in nanoseconds and the size, or "-" if the path
+        cannot be stat'ed.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return "-"
+    return f"{st.st_mtime_ns}:{st.st_size}"
 
 
-def analyze_codebase(repo_path: str = ".") -> Dict[str, object]:
+def _git_status_fingerprint(repo_path: Path) -> Optional[List[str]]:
+    """Describe the git state of the repository for a fingerprint.
+
+    The description covers the HEAD commit and every path git reports as
+    modified, staged, renamed or untracked, together with the current
+    modification time and size of each, so that further edits to an already
+    modified file are noticed too.
+
+    Args:
+        repo_path: Resolved path to the repository root.
+
+    Returns:
+        The parts describing the git state, or None if git cannot report it,
+        for example outside a git repository.
+    """
+    try:
+        result = subprocess.run(
+            ["git", "status", "--porcelain=v2", "--branch", "--untracked-files=all", "-z"],
+            cwd=repo_path,
+            check=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+    except (subprocess.CalledProcessError, FileNotFoundError, NotADirectoryError):
+        return None
+
+    parts = []
+    records = iter(result.stdout.split(b"\0"))
+    for record in records:
+        if not record:
+            continue
+        kind = record[:1]
+        if kind == b"#":
+            # Branch headers, including the HEAD commit as "branch.oid"
+            parts.append(os.fsdecode(record))
+            continue
+        if kind == b"1":
+            path = record.split(b" ", 8)[8]
+        elif kind == b"2":
+            path = record.split(b" ", 9)[9]
+            # Renames and copies are followed by their original path
+            next(records, None)
+        elif kind == b"u":
+            path = record.split(b" ", 10)[10]
+        else:
+            # Untracked ("?") and ignored ("!") entries
+            path = record[2:]
+        name = os.fsdecode(path)
+        parts.append(f"{os.fsdecode(record)}:{_stat_key(str(repo_path / name))}")
+    return parts
+
+
+def _analysis_fingerprint(repo_path: Path) -> Optional[str]:
+    """Compute a fingerprint of the repository state that the analysis depends on.
+
+    The fingerprint combines the package version, the git state (the HEAD
+    commit and every uncommitted change, see _git_status_fingerprint), the
+    modification time and size of every entry in the repository root except
+    .git, which covers the manifests the analyzer reads and new or deleted
+    entries in top-level directories, and the CI configuration outside the
+    root.
+
+    Files ignored by git below the top-level directories are not part of the
+    fingerprint, although the analysis does see them, so a new ignored file
+    with a new extension there is not noticed until something else changes.
+
+    Args:
+        repo_path: Resolved path to the repository root.
+
+    Returns:
+        A short hexadecimal fingerprint, or None if the repository is not in a
+        git work tree, in which case too little is known about it to cache.
+    """
+    git_parts = _git_status_fingerprint(repo_path)
+    if git_parts is None:
+        return None
+
+    parts = [__version__, *git_parts]
+    try:
+        with os.scandir(repo_path) as it:
+            # .git itself changes whenever git refreshes its index, so leave it out.
+            names = sorted(entry.name for entry in it if entry.name != ".git")
+    except OSError:
+        names = []
+    for name in names + list(_FINGERPRINT_NESTED_PATHS):
+        parts.append(f"{name}:{_stat_key(os.path.join(repo_path, name))}")
+    return hashlib.blake2b("\0".join(parts).encode("utf-8", "surrogateescape")).hexdigest()[:16]
+
+
+def analyze_codebase(repo_path: str = ".", use_cache: bool = True) -> Dict[str, object]:
     """Analyze the codebase and return the results.
 
+    Results are cached on disk, in one file per repository that also records a
+    fingerprint of the repository state, so repeated runs against an unchanged
+    repository skip the analysis. When the fingerprint no longer matches, the
+    analysis is rerun and the file overwritten. Only repositories in a git work
+    tree are cached.
+
     Args:
         repo_path: Path to the repository root. Defaults to current directory.
+        use_cache: Whether to use the on-disk analysis cache. Defaults to True.
+            The cache can also be disabled with GEMINI_PRECOMMIT_NO_CACHE.
 
     Returns:
         A dictionary containing analysis results.
     """
-    analyzer = CodebaseAnalyzer(repo_path)
-    return analyzer.analyze()
+    resolved_path = Path(repo_path).resolve()
+    cache_path = None
+    fingerprint = None
+    if use_cache and not is_cache_disabled():
+        fingerprint = _analysis_fingerprint(resolved_path)
+    if fingerprint is not None:
+        path_hash = hashlib.blake2b(os.fsencode(resolved_path)).hexdigest()[:16]
+        cache_path = get_cache_dir() / f"analysis-{path_hash}.json"
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            if entry.get("fingerprint") == fingerprint:
+                logger.debug(f"Using cached analysis results from {cache_path}")
+                return cast(Dict[str, object], entry["results"])
+            logger.debug("Cached analysis results are out of date")
+        except (OSError, ValueError, AttributeError, KeyError):
+            logger.debug("No usable cached analysis results found")
+
+    analyzer = CodebaseAnalyzer(str(resolved_path))
+    results = analyzer.analyze()
+
+    if cache_path is not None:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_text(
+                cache_path, json.dumps({"fingerprint": fingerprint, "results": results})
+            )
+            logger.debug(f"Cached analysis results at {cache_path}")
+        except OSError as e:
+            logger.debug(f"Failed to cache analysis results: {e}")
+
+    return results
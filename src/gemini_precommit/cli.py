@@ -8,9 +8,7 @@ from typing import Optional
 
 import click
 
-from gemini_precommit.generator import generate_hooks
 from gemini_precommit.logging import get_logger, setup_logging
-from gemini_precommit.utils import get_git_root, is_git_repository, is_pre_commit_installed, install_pre_commit
 
 
 @click.group()
@@ -73,16 +71,35 @@ def cli(log_level: str, log_file: Optional[str], quiet: bool) -> None:
     is_flag=True,
     help="Install the hooks after generating.",
 )
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Do not read or write the on-disk analysis and API response caches.",
+)
 def generate(
     repo_path: str = ".",
     api_key: Optional[str] = None,
     non_interactive: bool = False,
     install: bool = False,
+    no_cache: bool = False,
 ) -> None:
     """Generate pre-commit hooks for the repository."""
+    from gemini_precommit.generator import generate_hooks
+    from gemini_precommit.utils import (
+        get_git_root,
+        install_pre_commit,
+        is_git_repository,
+        is_pre_commit_installed,
+    )
+
     logger = get_logger("cli")
     logger.info(f"Starting pre-commit hook generation for {repo_path}")
 
+    if no_cache:
+        # Every cache checks this variable, so setting it disables them all
+        logger.debug("On-disk caching disabled")
+        os.environ["GEMINI_PRECOMMIT_NO_CACHE"] = "1"
+
     # Check if the path is a git repository
     logger.debug(f"Checking if {repo_path} is a git repository")
     if not is_git_repository(repo_path):
@@ -143,7 +160,7 @@ def generate(
 )
 def check_docs(repo_path: str = ".") -> None:
     """Check if documentation files are up-to-date."""
-    from gemini_precommit.utils import check_doc_freshness
+    from gemini_precommit.utils import check_doc_freshness, get_git_root, is_git_repository
 
     # Check if the path is a git repository
     if not is_git_repository(repo_path):
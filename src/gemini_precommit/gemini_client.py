@@ -4,75 +4,485 @@ This module handles communication with the Gemini API for generating
 pre-commit hook configurations based on codebase analysis.
 """
 
+import hashlib
 import json
+import logging
 import os
+import random
+import re
 import time
-from typing import Any, Dict, List, Optional
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Tuple, Type
 
-import google.generativeai as genai
-from dotenv import load_dotenv
+from gemini_precommit.logging import TRACE, get_logger
+from gemini_precommit.utils import atomic_write_text, get_cache_dir, is_cache_disabled
 
-from gemini_precommit.logging import get_logger
+logger = get_logger("gemini_client")
+
+# Matches a response optionally wrapped in a ``` or ```yaml code block, capturing
+# the content inside the fences. Every string matches.
+_FENCE_RE = re.compile(r"\A\s*(?:```(?:yaml)?)?(.*?)(?:```)?\s*\Z", re.DOTALL)
+
+# Static parts of the prompt. They are kept byte-identical across calls so that
+# only the analysis results in between vary, which lets a stable prefix be cached.
+# Every line is indented by eight spaces, as in the original inline prompt.
+_PROMPT_PREFIX = """
+        You are an expert in software development best practices and tooling. Your task is to generate
+        a comprehensive pre-commit hook configuration for a codebase with the following characteristics:
+
+        """
+
+_PROMPT_SUFFIX = """
+        Please generate a .pre-commit-config.yaml file that:
+        1. Includes appropriate hooks for the detected languages
+        2. Aligns with existing configurations
+        3. Complements the CI/CD workflows
+        4. Follows best practices for each language
+        5. Includes appropriate hooks for security, formatting, linting, and testing
+        6. Includes custom hooks for checking documentation freshness if appropriate
+
+        Return ONLY the YAML content for the .pre-commit-config.yaml file, without any explanations or markdown formatting.
+        The output should be valid YAML that can be directly saved to a .pre-commit-config.yaml file.
+        """
+
+# Static parts of the prompt used to generate configurations for several
+# repositories at once, with one <repo> section per repository in between,
+# indented in the same way as the single repository prompt
+_BATCH_PROMPT_PREFIX = (
+    "\n"
+    "        You are an expert in software development best practices and tooling. Your task is "
+    "to generate\n"
+    "        a comprehensive pre-commit hook configuration for each of the following codebases, "
+    "described in\n"
+    "        the <repo> sections below:\n"
+    "\n"
+)
+
+_BATCH_PROMPT_SUFFIX = (
+    "\n"
+    "        For each repository, please generate a .pre-commit-config.yaml file that:\n"
+    "        1. Includes appropriate hooks for the detected languages\n"
+    "        2. Aligns with existing configurations\n"
+    "        3. Complements the CI/CD workflows\n"
+    "        4. Follows best practices for each language\n"
+    "        5. Includes appropriate hooks for security, formatting, linting, and testing\n"
+    "        6. Includes custom hooks for checking documentation freshness if appropriate\n"
+    "\n"
+    "        Return ONLY the YAML content of the .pre-commit-config.yaml files, one YAML "
+    "document per repository\n"
+    '        in the order the repositories are listed, separated by lines containing only "---". '
+    "Do not include\n"
+    "        any explanations or markdown formatting. Each document should be valid YAML that "
+    "can be directly\n"
+    "        saved to a .pre-commit-config.yaml file.\n"
+    "        "
+)
+
+# Matches the "---" lines separating the YAML documents of a batch response
+_DOCUMENT_SEPARATOR_RE = re.compile(r"^---[ \t]*$", re.MULTILINE)
+
+# Configuration used when the analysis found nothing to base a configuration on
+_MINIMAL_CONFIG = """repos:
+  - repo: https://github.com/pre-commit/pre-commit-hooks
+    rev: v4.5.0
+    hooks:
+      - id: trailing-whitespace
+      - id: end-of-file-fixer
+      - id: check-yaml"""
+
+# GenerativeModel instances shared by all clients, keyed by API key
+_MODEL_CACHE: Dict[str, Any] = {}
+
+# Clients returned by get_gemini_client, keyed by API key
+_CLIENT_CACHE: Dict[str, "GeminiClient"] = {}
+
+# Default maximum age of a cached API response, after which the prompt is sent
+# again so that updated hook versions are picked up
+_DEFAULT_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+
+# Whether the .env file has already been loaded into the environment
+_DOTENV_LOADED = False
+
+# Transport used to talk to the Gemini API. gRPC multiplexes requests over one
+# long-lived HTTP/2 channel, which is reused as long as the API is not
+# reconfigured.
+_API_TRANSPORT = "grpc"
+
+# API key the google.generativeai module is currently configured with
+_CONFIGURED_API_KEY: Optional[str] = None
+
+# Upper bounds on how much of the analysis results is included in the prompt,
+# so that very large repositories do not produce huge prompts
+_MAX_PROMPT_ITEMS = 50
+_MAX_PROMPT_DEPENDENCIES = 20
+_MAX_PROMPT_CONFIGS_CHARS = 2048
+
+
+def _is_trivial_analysis(analysis_results: Dict[str, Any]) -> bool:
+    """Check whether an analysis found nothing to tailor a configuration to.
+
+    Args:
+        analysis_results: Results from the codebase analysis.
+
+    Returns:
+        True if no languages or file extensions were detected, False otherwise.
+    """
+    return not analysis_results.get("languages") and not analysis_results.get("file_extensions")
+
+
+def _bounded_join(items: List[str], limit: int = _MAX_PROMPT_ITEMS) -> str:
+    """Join items with commas, truncating the list to a maximum length.
+
+    Args:
+        items: The items to join.
+        limit: The maximum number of items to include.
+
+    Returns:
+        The joined items, followed by a count of the omitted ones if truncated.
+    """
+    joined = ", ".join(items[:limit])
+    if len(items) > limit:
+        joined += f" (+{len(items) - limit} more)"
+    return joined
+
+
+def _strip_fences(response: str) -> str:
+    """Remove the code fences a response may be wrapped in.
+
+    Args:
+        response: The response from the Gemini API.
+
+    Returns:
+        The content inside the fences, or the whole response if it has none.
+    """
+    match = _FENCE_RE.fullmatch(response)
+    # _FENCE_RE matches every string, so this is only a safeguard
+    return match.group(1) if match is not None else response
+
+
+def load_env_file() -> None:
+    """Load environment variables from the .env file, once per process.
+
+    This modifies os.environ, so callers that go on to use the environment from
+    several threads should call it before starting them.
+    """
+    global _DOTENV_LOADED
+
+    if _DOTENV_LOADED:
+        return
+
+    from dotenv import load_dotenv
+
+    logger.debug("Loading environment variables from .env file")
+    load_dotenv()
+    _DOTENV_LOADED = True
+
+
+def _configure_api(api_key: str) -> None:
+    """Configure google.generativeai for an API key, unless it already is.
+
+    Reconfiguring discards the underlying API clients and their connections, so
+    it is only done when switching to a different key.
+
+    Args:
+        api_key: Google Gemini API key.
+    """
+    global _CONFIGURED_API_KEY
+
+    if _CONFIGURED_API_KEY == api_key:
+        return
+
+    import google.generativeai as genai
+
+    logger.debug("Configuring Gemini API")
+    genai.configure(api_key=api_key, transport=_API_TRANSPORT)
+    _CONFIGURED_API_KEY = api_key
+
+
+def _retry_delay_hint(error: Exception) -> Optional[float]:
+    """Get the retry delay suggested by the server for a failed API call.
+
+    The delay may be attached to the error itself or to one of its details,
+    such as a google.rpc.RetryInfo message.
+
+    Args:
+        error: The error raised by the API call.
+
+    Returns:
+        The suggested delay in seconds, or None if the server gave no hint.
+    """
+    for candidate in [error, *(getattr(error, "details", None) or [])]:
+        delay = getattr(candidate, "retry_delay", None)
+        if delay is None:
+            continue
+        if hasattr(delay, "total_seconds"):
+            return float(delay.total_seconds())
+        if hasattr(delay, "seconds"):
+            return float(delay.seconds + getattr(delay, "nanos", 0) / 1e9)
+    return None
 
 
 class GeminiClient:
     """Client for interacting with Google's Gemini API."""
 
-    def __init__(self, api_key: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 32.0,
+        cache_enabled: bool = True,
+        cache_ttl_seconds: Optional[int] = _DEFAULT_CACHE_TTL_SECONDS,
+    ) -> None:
         """Initialize the Gemini client.
 
         Args:
             api_key: Google Gemini API key. If not provided, will try to load from
                 environment variable GOOGLE_GEMINI_API_KEY.
+            max_retries: Maximum number of times a rate-limited or transiently
+                failing API call is retried. Defaults to 5.
+            base_delay: Initial backoff delay in seconds. Defaults to 1.0.
+            max_delay: Upper bound on the backoff delay in seconds. Defaults to 32.0.
+            cache_enabled: Whether to cache API responses on disk, keyed by the
+                prompt. Defaults to True. The cache can also be disabled with the
+                GEMINI_PRECOMMIT_NO_CACHE environment variable.
+            cache_ttl_seconds: Maximum age of a cached response in seconds. If
+                None, cached responses never expire. Defaults to seven days.
         """
-        self.logger = get_logger("gemini_client")
-        self.logger.info("Initializing Gemini client")
+        logger.info("Initializing Gemini client")
 
-        # Load environment variables from .env file
-        self.logger.debug("Loading environment variables from .env file")
-        load_dotenv()
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.cache_enabled = cache_enabled and not is_cache_disabled()
+        self.cache_ttl_seconds = cache_ttl_seconds
+
+        load_env_file()
 
         # Use provided API key or get from environment
-        self.api_key = api_key or os.getenv("GOOGLE_GEMINI_API_KEY")
-        if not self.api_key:
-            self.logger.error("Gemini API key not provided")
+        key = api_key or os.getenv("GOOGLE_GEMINI_API_KEY")
+        if not key:
+            logger.error("Gemini API key not provided")
             raise ValueError(
                 "Gemini API key not provided. Set GOOGLE_GEMINI_API_KEY environment variable "
                 "or pass api_key parameter."
             )
-        self.logger.debug("API key found")
+        self.api_key: str = key
+        logger.debug("API key found")
+        logger.info("Gemini client initialized successfully")
 
-        # Configure the Gemini API
-        self.logger.debug("Configuring Gemini API")
-        genai.configure(api_key=self.api_key)
-        self.model = genai.GenerativeModel("gemini-pro")
-        self.logger.info("Gemini client initialized successfully")
+    @cached_property
+    def model(self) -> Any:
+        """The Gemini model used to generate configurations.
 
-    def generate_precommit_config(self, analysis_results: Dict[str, Any]) -> Dict[str, Any]:
+        The Gemini API is configured on first access, so clients whose responses
+        are served from the cache never import google.generativeai, which pulls
+        in gRPC and protobuf. Models are reused across clients with the same key.
+        """
+        import google.generativeai as genai
+
+        model = _MODEL_CACHE.get(self.api_key)
+        if model is None:
+            _configure_api(self.api_key)
+            model = _MODEL_CACHE[self.api_key] = genai.GenerativeModel("gemini-pro")
+        return model
+
+    @cached_property
+    def _retryable_errors(self) -> Tuple[Type[Exception], ...]:
+        """The API errors that are considered transient and worth retrying."""
+        from google.api_core import exceptions as google_exceptions
+
+        return (
+            google_exceptions.ResourceExhausted,
+            google_exceptions.ServiceUnavailable,
+            google_exceptions.InternalServerError,
+            google_exceptions.DeadlineExceeded,
+        )
+
+    def generate_precommit_config(
+        self, analysis_results: Dict[str, Any], include_raw: Optional[bool] = None
+    ) -> Dict[str, Any]:
         """Generate a pre-commit configuration based on codebase analysis.
 
         Args:
             analysis_results: Results from the codebase analysis.
+            include_raw: Whether to include the raw API response in the result. If
+                None, it is only included when debug logging is enabled.
 
         Returns:
             A dictionary containing the generated pre-commit configuration.
         """
-        self.logger.info("Generating pre-commit configuration based on analysis results")
+        logger.info("Generating pre-commit configuration based on analysis results")
 
-        self.logger.debug("Creating prompt for Gemini API")
+        # Without any detected files there is nothing for Gemini to tailor the
+        # configuration to, so skip the API call
+        if _is_trivial_analysis(analysis_results):
+            logger.info("No files detected, using a minimal pre-commit configuration")
+            return {"yaml_content": _MINIMAL_CONFIG}
+
+        logger.debug("Creating prompt for Gemini API")
         prompt = self._create_prompt(analysis_results)
+        prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+        response = self._cache_get(prompt_hash)
+        if response is None:
+            response = self._timed_api_call(prompt)
+            self._cache_put(prompt_hash, response)
+
+        logger.debug("Parsing API response")
+        result = self._parse_response(response, include_raw)
+        logger.info("Pre-commit configuration generated successfully")
+
+        return result
+
+    def generate_precommit_configs_batch(
+        self,
+        analyses: List[Dict[str, Any]],
+        names: Optional[List[str]] = None,
+        include_raw: Optional[bool] = None,
+    ) -> List[Dict[str, Any]]:
+        """Generate pre-commit configurations for several codebases with one API call.
+
+        Args:
+            analyses: Results from the codebase analysis of each repository.
+            names: Names identifying each repository in the prompt. Defaults to
+                their position in the list.
+            include_raw: Whether to include the raw API response in each result. If
+                None, it is only included when debug logging is enabled.
+
+        Returns:
+            A list with a dictionary containing the generated pre-commit
+            configuration for each repository, in the same order as the analyses.
+
+        Raises:
+            ValueError: If the response does not contain one configuration per
+                repository.
+        """
+        logger.info(f"Generating pre-commit configurations for {len(analyses)} repositories")
+        if names is None:
+            names = [str(i) for i in range(len(analyses))]
+
+        results: List[Dict[str, Any]] = [{"yaml_content": _MINIMAL_CONFIG} for _ in analyses]
+        pending = [i for i, analysis in enumerate(analyses) if not _is_trivial_analysis(analysis)]
+        if not pending:
+            logger.info("No files detected, using minimal pre-commit configurations")
+            return results
+
+        logger.debug("Creating batch prompt for Gemini API")
+        prompt = self._create_batch_prompt(
+            [names[i] for i in pending], [analyses[i] for i in pending]
+        )
+        prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+        cached_response = self._cache_get(prompt_hash)
+        if cached_response is not None:
+            response = cached_response
+        else:
+            response = self._timed_api_call(prompt)
+
+        logger.debug("Parsing batch API response")
+        documents = self._split_batch_response(response)
+        if len(documents) != len(pending):
+            raise ValueError(
+                f"Expected {len(pending)} configurations in the Gemini API response, "
+                f"got {len(documents)}"
+            )
+        # Only cache responses that could be split, so a malformed response is
+        # not returned again on the next run
+        if cached_response is None:
+            self._cache_put(prompt_hash, response)
 
-        self.logger.debug("Calling Gemini API")
+        for i, document in zip(pending, documents):
+            results[i] = self._parse_response(document, include_raw)
+        logger.info("Pre-commit configurations generated successfully")
+
+        return results
+
+    def _timed_api_call(self, prompt: str) -> str:
+        """Call the Gemini API with the given prompt, logging how long it took.
+
+        Args:
+            prompt: The prompt to send to the Gemini API.
+
+        Returns:
+            The response from the Gemini API.
+        """
+        logger.debug("Calling Gemini API")
         start_time = time.time()
         response = self._call_gemini_api(prompt)
         elapsed_time = time.time() - start_time
-        self.logger.debug(f"Gemini API call completed in {elapsed_time:.2f} seconds")
+        logger.debug(f"Gemini API call completed in {elapsed_time:.2f} seconds")
+        return response
 
-        self.logger.debug("Parsing API response")
-        result = self._parse_response(response)
-        self.logger.info("Pre-commit configuration generated successfully")
+    def _cache_get(self, prompt_hash: str) -> Optional[str]:
+        """Get a cached API response for a prompt.
 
-        return result
+        Args:
+            prompt_hash: SHA-256 hex digest of the prompt.
+
+        Returns:
+            The cached response, or None if caching is disabled or there is no
+            fresh cached response.
+        """
+        if not self.cache_enabled:
+            return None
+
+        cache_path = get_cache_dir() / f"{prompt_hash}.yaml"
+        try:
+            if self.cache_ttl_seconds is not None:
+                age = time.time() - cache_path.stat().st_mtime
+                if age > self.cache_ttl_seconds:
+                    logger.debug(f"Cached response at {cache_path} has expired, removing it")
+                    cache_path.unlink()
+                    return None
+            response = cache_path.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            return None
+
+        logger.info(f"Using cached Gemini API response from {cache_path}")
+        return response
+
+    def _cache_put(self, prompt_hash: str, response: str) -> None:
+        """Cache an API response for a prompt.
+
+        Cached responses older than the TTL are removed at the same time, so
+        responses to prompts that are never sent again do not pile up.
+
+        Args:
+            prompt_hash: SHA-256 hex digest of the prompt.
+            response: The response from the Gemini API.
+        """
+        if not self.cache_enabled:
+            return
+
+        cache_path = get_cache_dir() / f"{prompt_hash}.yaml"
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_text(cache_path, response)
+            logger.debug(f"Cached Gemini API response at {cache_path}")
+        except OSError as e:
+            logger.debug(f"Failed to cache Gemini API response: {e}")
+        self._prune_cache()
+
+    def _prune_cache(self) -> None:
+        """Remove the cached API responses older than the TTL."""
+        if self.cache_ttl_seconds is None:
+            return
+
+        cutoff = time.time() - self.cache_ttl_seconds
+        try:
+            with os.scandir(get_cache_dir()) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(".yaml"):
+                        continue
+                    try:
+                        if entry.stat().st_mtime < cutoff:
+                            os.unlink(entry.path)
+                            logger.debug(f"Removed expired cached response {entry.path}")
+                    except OSError:
+                        continue
+        except OSError:
+            pass
 
     def _create_prompt(self, analysis_results: Dict[str, Any]) -> str:
         """Create a prompt for the Gemini API based on analysis results.
@@ -83,35 +493,58 @@ class GeminiClient:
         Returns:
             A string prompt for the Gemini API.
         """
-        file_extensions = analysis_results.get("file_extensions", [])
-        languages = analysis_results.get("languages", [])
-        python_dependencies = analysis_results.get("python_dependencies", [])
-        existing_configs = analysis_results.get("existing_configs", {})
-        ci_workflows = analysis_results.get("ci_workflows", [])
+        return "".join([_PROMPT_PREFIX, *self._describe_analysis(analysis_results), _PROMPT_SUFFIX])
 
-        prompt = f"""
-        You are an expert in software development best practices and tooling. Your task is to generate
-        a comprehensive pre-commit hook configuration for a codebase with the following characteristics:
+    def _create_batch_prompt(self, names: List[str], analyses: List[Dict[str, Any]]) -> str:
+        """Create a prompt for the Gemini API covering several repositories.
 
-        File extensions: {', '.join(file_extensions)}
-        Programming languages: {', '.join(languages)}
-        Python dependencies: {', '.join(python_dependencies[:20])}{"..." if len(python_dependencies) > 20 else ""}
-        Existing configurations: {json.dumps(existing_configs)}
-        CI/CD workflows: {', '.join(ci_workflows)}
+        Args:
+            names: Names identifying each repository.
+            analyses: Results from the codebase analysis of each repository.
 
-        Please generate a .pre-commit-config.yaml file that:
-        1. Includes appropriate hooks for the detected languages
-        2. Aligns with existing configurations
-        3. Complements the CI/CD workflows
-        4. Follows best practices for each language
-        5. Includes appropriate hooks for security, formatting, linting, and testing
-        6. Includes custom hooks for checking documentation freshness if appropriate
+        Returns:
+            A string prompt for the Gemini API.
+        """
+        parts = [_BATCH_PROMPT_PREFIX]
+        for name, analysis_results in zip(names, analyses):
+            parts.append(f'        <repo name="{name}">\n        ')
+            parts.extend(self._describe_analysis(analysis_results))
+            parts.append("        </repo>\n")
+        parts.append(_BATCH_PROMPT_SUFFIX)
+        return "".join(parts)
 
-        Return ONLY the YAML content for the .pre-commit-config.yaml file, without any explanations or markdown formatting.
-        The output should be valid YAML that can be directly saved to a .pre-commit-config.yaml file.
+    def _describe_analysis(self, analysis_results: Dict[str, Any]) -> List[str]:
+        """Describe the analysis results of a repository for a prompt.
+
+        Args:
+            analysis_results: Results from the codebase analysis.
+
+        Returns:
+            The pieces of the description, to be joined into the prompt.
         """
+        file_extensions = analysis_results.get("file_extensions", [])
+        languages = analysis_results.get("languages", [])
+        python_dependencies = analysis_results.get("python_dependencies", [])
+        existing_configs = analysis_results.get("existing_configs", {})
+        ci_workflows = analysis_results.get("ci_workflows", [])
 
-        return prompt
+        configs = json.dumps(existing_configs, separators=(",", ":"))
+        if len(configs) > _MAX_PROMPT_CONFIGS_CHARS:
+            configs = configs[:_MAX_PROMPT_CONFIGS_CHARS] + "..."
+
+        return [
+            "File extensions: ",
+            _bounded_join(file_extensions),
+            "\n        Programming languages: ",
+            _bounded_join(languages),
+            "\n        Python dependencies: ",
+            _bounded_join(python_dependencies, _MAX_PROMPT_DEPENDENCIES),
+            "\n        Existing configurations: ",
+            configs,
+            "\n        CI/CD workflows: ",
+            _bounded_join(ci_workflows),
+            "\n",
+        ]
 
     def _call_gemini_api(self, prompt: str) -> str:
         """Call the Gemini API with the given prompt.
@@ -122,79 +555,177 @@ class GeminiClient:
         Returns:
             The response from the Gemini API.
 
+        The response is streamed and assembled from its chunks as they arrive.
+        Rate-limit and transient server errors are retried with exponential
+        backoff and full jitter, waiting at least as long as any retry delay
+        suggested by the server.
+
         Raises:
             Exception: If the API call fails.
         """
-        self.logger.trace(f"Sending prompt to Gemini API: {prompt[:100]}...")
+        if logger.isEnabledFor(TRACE):
+            logger.trace("Sending prompt to Gemini API: %s...", prompt[:100])
+
+        # Models pick up the API client of the current configuration when first
+        # used, which may have been changed by a client with another key
+        if _CONFIGURED_API_KEY not in (None, self.api_key):
+            _configure_api(self.api_key)
+
+        attempt = 0
+        while True:
+            try:
+                logger.debug("Making API request to Gemini")
+                chunks = []
+                trace_enabled = logger.isEnabledFor(TRACE)
+                for chunk in self.model.generate_content(prompt, stream=True):
+                    text = chunk.text
+                    chunks.append(text)
+                    if trace_enabled:
+                        logger.trace("Received %d characters from Gemini API", len(text))
+                response_text = "".join(chunks)
+                logger.debug("Received response from Gemini API")
+                if trace_enabled:
+                    logger.trace("Raw response: %s...", response_text[:100])
+                return response_text
+            except self._retryable_errors as e:
+                if attempt >= self.max_retries:
+                    error = e
+                    break
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+                hint = _retry_delay_hint(e)
+                if hint is not None:
+                    delay = max(delay, hint)
+                attempt += 1
+                logger.warning(
+                    f"Gemini API call failed ({e}), retrying in {delay:.1f} seconds "
+                    f"(retry {attempt} of {self.max_retries})"
+                )
+                time.sleep(delay)
+            except Exception as e:
+                error = e
+                break
+
+        error_msg = f"Failed to call Gemini API: {str(error)}"
+        logger.error(error_msg)
+        logger.debug("Full error details: %s", error, exc_info=error)
+        raise Exception(error_msg) from error
+
+    def _split_batch_response(self, response: str) -> List[str]:
+        """Split a batch response from the Gemini API into its YAML documents.
 
-        try:
-            self.logger.debug("Making API request to Gemini")
-            response = self.model.generate_content(prompt)
-            self.logger.debug("Received response from Gemini API")
-            self.logger.trace(f"Raw response: {response.text[:100]}...")
-            return response.text
-        except Exception as e:
-            error_msg = f"Failed to call Gemini API: {str(e)}"
-            self.logger.error(error_msg)
-            self.logger.debug(f"Full error details: {e}", exc_info=True)
-            raise Exception(error_msg) from e
+        Args:
+            response: The response from the Gemini API.
 
-    def _parse_response(self, response: str) -> Dict[str, Any]:
+        Returns:
+            The non-empty YAML documents in the response, in order.
+        """
+        content = _strip_fences(response)
+        documents = [document.strip() for document in _DOCUMENT_SEPARATOR_RE.split(content)]
+        return [document for document in documents if document]
+
+    def _parse_response(self, response: str, include_raw: Optional[bool] = None) -> Dict[str, Any]:
         """Parse the response from the Gemini API.
 
         Args:
             response: The response from the Gemini API.
+            include_raw: Whether to include the raw response in the result. If
+                None, it is only included when debug logging is enabled.
 
         Returns:
-            A dictionary containing the parsed pre-commit configuration.
+            A dictionary containing the parsed pre-commit configuration under
+            "yaml_content", and the raw response under "raw_response" if it was
+            requested and differs from the extracted content.
 
         Raises:
             ValueError: If the response cannot be parsed.
         """
-        self.logger.debug("Parsing Gemini API response")
+        logger.debug("Parsing Gemini API response")
         try:
-            # Clean up the response to extract just the YAML content
-            yaml_content = response.strip()
-            self.logger.trace(f"Initial response length: {len(yaml_content)} characters")
-
-            # If the response is wrapped in code blocks, extract just the content
-            if yaml_content.startswith("```yaml"):
-                self.logger.debug("Detected ```yaml code block, extracting content")
-                yaml_content = yaml_content.split("```yaml", 1)[1]
-            if yaml_content.startswith("```"):
-                self.logger.debug("Detected ``` code block, extracting content")
-                yaml_content = yaml_content.split("```", 1)[1]
-            if yaml_content.endswith("```"):
-                self.logger.debug("Detected trailing ``` code block, removing it")
-                yaml_content = yaml_content.rsplit("```", 1)[0]
-
-            yaml_content = yaml_content.strip()
-            self.logger.debug(f"Extracted YAML content length: {len(yaml_content)} characters")
-            self.logger.trace(f"YAML content starts with: {yaml_content[:50]}...")
-
-            result = {
-                "yaml_content": yaml_content,
-                "raw_response": response
-            }
-            self.logger.debug("Successfully parsed Gemini API response")
+            logger.trace("Initial response length: %d characters", len(response))
+
+            # If the response is wrapped in a code block, extract just the content
+            yaml_content = _strip_fences(response).strip()
+
+            logger.debug(f"Extracted YAML content length: {len(yaml_content)} characters")
+            if logger.isEnabledFor(TRACE):
+                logger.trace("YAML content starts with: %s...", yaml_content[:50])
+
+            result = {"yaml_content": yaml_content}
+            # The raw response is only useful for debugging, and is not kept if it
+            # matches the extracted content, to avoid holding two copies of the text
+            if include_raw is None:
+                include_raw = logger.isEnabledFor(logging.DEBUG)
+            if include_raw and yaml_content != response:
+                result["raw_response"] = response
+            logger.debug("Successfully parsed Gemini API response")
             return result
         except Exception as e:
             error_msg = f"Failed to parse Gemini API response: {str(e)}"
-            self.logger.error(error_msg)
-            self.logger.debug(f"Full error details: {e}", exc_info=True)
+            logger.error(error_msg)
+            logger.debug("Full error details: %s", e, exc_info=True)
             raise ValueError(error_msg) from e
 
 
-def generate_precommit_config(analysis_results: Dict[str, Any], api_key: Optional[str] = None) -> Dict[str, Any]:
+def get_gemini_client(api_key: Optional[str] = None) -> GeminiClient:
+    """Get a Gemini client for the given API key, reusing an existing one if possible.
+
+    Args:
+        api_key: Google Gemini API key. If not provided, will try to load from
+            environment variable GOOGLE_GEMINI_API_KEY.
+
+    Returns:
+        A Gemini client shared by all callers using the same API key.
+    """
+    key = api_key or os.getenv("GOOGLE_GEMINI_API_KEY")
+    client = _CLIENT_CACHE.get(key) if key else None
+    if client is None:
+        client = GeminiClient(api_key)
+        client = _CLIENT_CACHE.setdefault(client.api_key, client)
+    return client
+
+
+def generate_precommit_config(
+    analysis_results: Dict[str, Any],
+    api_key: Optional[str] = None,
+    client: Optional[GeminiClient] = None,
+) -> Dict[str, Any]:
     """Generate a pre-commit configuration based on codebase analysis.
 
     Args:
         analysis_results: Results from the codebase analysis.
         api_key: Google Gemini API key. If not provided, will try to load from
-            environment variable GOOGLE_GEMINI_API_KEY.
+            environment variable GOOGLE_GEMINI_API_KEY. Ignored if client is given.
+        client: An already initialized Gemini client to use. If not provided, a
+            shared client for the API key is used.
 
     Returns:
         A dictionary containing the generated pre-commit configuration.
     """
-    client = GeminiClient(api_key)
+    if client is None:
+        client = get_gemini_client(api_key)
     return client.generate_precommit_config(analysis_results)
+
+
+def generate_precommit_configs_batch(
+    analyses: List[Dict[str, Any]],
+    names: Optional[List[str]] = None,
+    api_key: Optional[str] = None,
+    client: Optional[GeminiClient] = None,
+) -> List[Dict[str, Any]]:
+    """Generate pre-commit configurations for several codebases with one API call.
+
+    Args:
+        analyses: Results from the codebase analysis of each repository.
+        names: Names identifying each repository in the prompt.
+        api_key: Google Gemini API key. If not provided, will try to load from
+            environment variable GOOGLE_GEMINI_API_KEY. Ignored if client is given.
+        client: An already initialized Gemini client to use. If not provided, the
+            shared client for the API key is used.
+
+    Returns:
+        A list with a dictionary containing the generated pre-commit
+        configuration for each repository, in the same order as the analyses.
+    """
+    if client is None:
+        client = get_gemini_client(api_key)
+    return client.generate_precommit_configs_batch(analyses, names)
@@ -4,18 +4,27 @@ This module generates pre-commit hook configurations based on codebase analysis
 and Gemini API responses.
 """
 
-import os
 import subprocess
-import sys
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
-
-import yaml
+from typing import Any, Deque, Dict, List, Optional
 
 from gemini_precommit.analyzer import analyze_codebase
-from gemini_precommit.gemini_client import generate_precommit_config
+from gemini_precommit.gemini_client import (
+    generate_precommit_config,
+    generate_precommit_configs_batch,
+    get_gemini_client,
+    load_env_file,
+)
 from gemini_precommit.logging import get_logger
+from gemini_precommit.utils import atomic_write_text
+
+logger = get_logger("generator")
+
+# Number of trailing lines of 'pre-commit install' output kept for error messages
+_INSTALL_OUTPUT_TAIL_LINES = 20
 
 
 class PrecommitGenerator:
@@ -32,15 +41,14 @@ class PrecommitGenerator:
                 environment variable GOOGLE_GEMINI_API_KEY.
             non_interactive: Whether to run in non-interactive mode. Defaults to False.
         """
-        self.logger = get_logger("generator")
-        self.logger.info(f"Initializing pre-commit generator for repository at {repo_path}")
+        logger.info(f"Initializing pre-commit generator for repository at {repo_path}")
 
         self.repo_path = Path(repo_path).resolve()
         self.api_key = api_key
         self.non_interactive = non_interactive
         self.config_path = self.repo_path / ".pre-commit-config.yaml"
-        self.logger.debug(f"Config path set to {self.config_path}")
-        self.logger.debug(f"Non-interactive mode: {self.non_interactive}")
+        logger.debug(f"Config path set to {self.config_path}")
+        logger.debug(f"Non-interactive mode: {self.non_interactive}")
 
         self.analysis_results: Dict[str, Any] = {}
         self.generated_config: Dict[str, Any] = {}
@@ -51,20 +59,24 @@ class PrecommitGenerator:
         Returns:
             A dictionary containing the generated pre-commit configuration.
         """
-        self.logger.info("Starting pre-commit hook generation process")
+        logger.info("Starting pre-commit hook generation process")
 
-        self.logger.info("Analyzing codebase...")
+        # The .env file may set variables the analysis reads, such as the cache
+        # settings, so load it first
+        load_env_file()
+
+        logger.info("Analyzing codebase...")
         start_time = time.time()
         self.analysis_results = analyze_codebase(str(self.repo_path))
         elapsed_time = time.time() - start_time
-        self.logger.debug(f"Codebase analysis completed in {elapsed_time:.2f} seconds")
+        logger.debug(f"Codebase analysis completed in {elapsed_time:.2f} seconds")
 
-        self.logger.info("Generating pre-commit configuration...")
+        logger.info("Generating pre-commit configuration...")
         start_time = time.time()
         self.generated_config = generate_precommit_config(self.analysis_results, self.api_key)
         elapsed_time = time.time() - start_time
-        self.logger.debug(f"Configuration generation completed in {elapsed_time:.2f} seconds")
-        self.logger.info("Pre-commit hook generation completed successfully")
+        logger.debug(f"Configuration generation completed in {elapsed_time:.2f} seconds")
+        logger.info("Pre-commit hook generation completed successfully")
 
         return self.generated_config
 
@@ -77,23 +89,31 @@ class PrecommitGenerator:
         Returns:
             True if the configuration was applied successfully, False otherwise.
         """
-        self.logger.info("Applying generated configuration to repository")
+        logger.info("Applying generated configuration to repository")
 
         if not self.generated_config:
-            self.logger.error("No configuration generated. Run generate() first.")
+            logger.error("No configuration generated. Run generate() first.")
             print("No configuration generated. Run generate() first.")
             return False
 
         yaml_content = self.generated_config.get("yaml_content", "")
         if not yaml_content:
-            self.logger.error("Generated configuration is empty")
+            logger.error("Generated configuration is empty")
             print("Generated configuration is empty.")
             return False
 
+        # Leave the file untouched if it already has the generated content, so
+        # its mtime (and pre-commit's cache) is preserved
+        existing_content = self._read_existing_config()
+        unchanged = existing_content == yaml_content
+        if unchanged:
+            logger.info(f"Configuration at {self.config_path} is unchanged, skipping write")
+            print(f"Configuration at {self.config_path} is already up to date")
+
         # If the file exists and we're in interactive mode, ask for confirmation
-        if self.config_path.exists() and not self.non_interactive:
-            self.logger.info(f"Existing configuration found at {self.config_path}")
-            self.logger.debug(f"Generated configuration length: {len(yaml_content)} characters")
+        elif existing_content is not None and not self.non_interactive:
+            logger.info(f"Existing configuration found at {self.config_path}")
+            logger.debug(f"Generated configuration length: {len(yaml_content)} characters")
 
             print(f"\nExisting configuration found at {self.config_path}")
             print("\nGenerated configuration:")
@@ -103,68 +123,100 @@ class PrecommitGenerator:
 
             response = input("\nDo you want to replace the existing configuration? (y/n): ")
             if response.lower() != "y":
-                self.logger.info("User chose not to apply the configuration")
+                logger.info("User chose not to apply the configuration")
                 print("Configuration not applied.")
                 return False
 
-            self.logger.info("User confirmed configuration replacement")
-
-        # Write the configuration to the file
-        try:
-            self.logger.info(f"Writing configuration to {self.config_path}")
-            with open(self.config_path, "w", encoding="utf-8") as f:
-                f.write(yaml_content)
-            self.logger.info(f"Configuration successfully written to {self.config_path}")
-            print(f"Configuration written to {self.config_path}")
-        except Exception as e:
-            error_msg = f"Failed to write configuration: {str(e)}"
-            self.logger.error(error_msg)
-            self.logger.debug(f"Full error details: {e}", exc_info=True)
-            print(error_msg)
-            return False
+            logger.info("User confirmed configuration replacement")
+
+        # Write the configuration to the file. The write is atomic, so a failure
+        # never leaves a truncated configuration behind.
+        if not unchanged:
+            try:
+                logger.info(f"Writing configuration to {self.config_path}")
+                atomic_write_text(self.config_path, yaml_content)
+                logger.info(f"Configuration successfully written to {self.config_path}")
+                print(f"Configuration written to {self.config_path}")
+            except Exception as e:
+                error_msg = f"Failed to write configuration: {str(e)}"
+                logger.error(error_msg)
+                logger.debug("Full error details: %s", e, exc_info=True)
+                print(error_msg)
+                return False
 
         # Install the hooks if requested
         if install:
-            self.logger.info("Installing pre-commit hooks")
+            logger.info("Installing pre-commit hooks")
             return self._install_hooks()
 
-        self.logger.info("Configuration applied successfully")
+        logger.info("Configuration applied successfully")
         return True
 
+    def _read_existing_config(self) -> Optional[str]:
+        """Read the existing pre-commit configuration, if any.
+
+        The file is only opened once, so its existence is known without a
+        separate stat call.
+
+        Returns:
+            The content of the existing configuration file, an empty string if it
+            exists but cannot be read, or None if it does not exist.
+        """
+        try:
+            return self.config_path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        except (OSError, UnicodeDecodeError) as e:
+            logger.debug(f"Could not read existing configuration: {e}")
+            return ""
+
     def _install_hooks(self) -> bool:
         """Install the pre-commit hooks.
 
         Returns:
             True if the hooks were installed successfully, False otherwise.
         """
-        self.logger.info("Installing pre-commit hooks")
+        logger.info("Installing pre-commit hooks")
         try:
             print("Installing pre-commit hooks...")
-            self.logger.debug(f"Running 'pre-commit install' in {self.repo_path}")
+            logger.debug(f"Running 'pre-commit install' in {self.repo_path}")
             start_time = time.time()
-            result = subprocess.run(
-                ["pre-commit", "install"],
+            # Stream the output as it is produced, since installing hook
+            # environments can take a while. Only the last lines are kept, for
+            # the error message.
+            command = ["pre-commit", "install"]
+            tail: Deque[str] = deque(maxlen=_INSTALL_OUTPUT_TAIL_LINES)
+            with subprocess.Popen(
+                command,
                 cwd=str(self.repo_path),
-                check=True,
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
                 text=True,
-            )
+                bufsize=1,
+            ) as process:
+                assert process.stdout is not None
+                for line in process.stdout:
+                    print(line, end="", flush=True)
+                    logger.debug("Installation output: %s", line.rstrip())
+                    tail.append(line)
+            if process.returncode:
+                raise subprocess.CalledProcessError(
+                    process.returncode, command, output="".join(tail)
+                )
             elapsed_time = time.time() - start_time
-            self.logger.debug(f"Hook installation completed in {elapsed_time:.2f} seconds")
-            self.logger.debug(f"Installation output: {result.stdout}")
-            print(result.stdout)
-            self.logger.info("Pre-commit hooks installed successfully")
+            logger.debug(f"Hook installation completed in {elapsed_time:.2f} seconds")
+            logger.info("Pre-commit hooks installed successfully")
             return True
         except subprocess.CalledProcessError as e:
-            error_msg = f"Failed to install hooks: {e.stderr}"
-            self.logger.error(error_msg)
-            self.logger.debug(f"Command failed with return code {e.returncode}")
+            error_msg = f"Failed to install hooks: {e.output.rstrip()}"
+            logger.error(error_msg)
+            logger.debug(f"Command failed with return code {e.returncode}")
             print(error_msg)
             return False
         except Exception as e:
             error_msg = f"Failed to install hooks: {str(e)}"
-            self.logger.error(error_msg)
-            self.logger.debug(f"Full error details: {e}", exc_info=True)
+            logger.error(error_msg)
+            logger.debug("Full error details: %s", e, exc_info=True)
             print(error_msg)
             return False
 
@@ -188,8 +240,75 @@ def generate_hooks(
         A dictionary containing the generated pre-commit configuration.
     """
     generator = PrecommitGenerator(repo_path, api_key, non_interactive)
-    config = generator.generate()
+    generator.generate()
+    return _apply_generated_config(generator, install)
+
+
+def generate_hooks_batch(
+    repo_paths: List[str],
+    api_key: Optional[str] = None,
+    non_interactive: bool = False,
+    install: bool = False,
+) -> List[Dict[str, Any]]:
+    """Generate pre-commit hooks for several repositories with a single Gemini API call.
 
+    If the batched response cannot be split into one configuration per repository,
+    the configurations are generated with one API call per repository instead.
+
+    Args:
+        repo_paths: Paths to the repository roots.
+        api_key: Google Gemini API key. If not provided, will try to load from
+            environment variable GOOGLE_GEMINI_API_KEY.
+        non_interactive: Whether to run in non-interactive mode. Defaults to False.
+        install: Whether to install the hooks after generating. Defaults to False.
+
+    Returns:
+        A list with the result of generating the hooks for each repository, as
+        returned by generate_hooks, in the same order as the repository paths.
+    """
+    logger.info(f"Starting pre-commit hook generation for {len(repo_paths)} repositories")
+    generators = [PrecommitGenerator(path, api_key, non_interactive) for path in repo_paths]
+
+    # Load the .env file before the threads start, as in PrecommitGenerator.generate
+    load_env_file()
+
+    # The analyses are filesystem-bound, so run them alongside each other
+    logger.info("Analyzing codebases...")
+    with ThreadPoolExecutor() as executor:
+        analyses = list(executor.map(analyze_codebase, [str(g.repo_path) for g in generators]))
+    client = get_gemini_client(api_key)
+    for generator, analysis_results in zip(generators, analyses):
+        generator.analysis_results = analysis_results
+
+    # Repositories in different directories may share a name, so number the
+    # labels the configurations are matched up by
+    names = [f"{i + 1}-{g.repo_path.name}" for i, g in enumerate(generators)]
+
+    logger.info("Generating pre-commit configurations...")
+    try:
+        configs = generate_precommit_configs_batch(analyses, names, client=client)
+    except ValueError as e:
+        logger.warning(f"{e}, generating configurations one repository at a time")
+        configs = [generate_precommit_config(analysis, client=client) for analysis in analyses]
+
+    results = []
+    for generator, config in zip(generators, configs):
+        generator.generated_config = config
+        results.append(_apply_generated_config(generator, install))
+    return results
+
+
+def _apply_generated_config(generator: PrecommitGenerator, install: bool) -> Dict[str, Any]:
+    """Apply the configuration generated by a generator and describe the outcome.
+
+    Args:
+        generator: The generator whose configuration to apply.
+        install: Whether to install the hooks after applying the configuration.
+
+    Returns:
+        A dictionary containing the generated pre-commit configuration.
+    """
+    config = generator.generated_config
     if generator.apply_config(install):
         return {
             "success": True,
@@ -4,7 +4,7 @@ import logging
 import os
 import sys
 from pathlib import Path
-from typing import Optional, Union
+from typing import Any, Optional, Union
 
 # Define log levels with more descriptive names
 TRACE = 5  # More detailed than DEBUG
@@ -20,6 +20,9 @@ def trace(self, message, *args, **kwargs):
 # Add trace method to Logger class
 logging.Logger.trace = trace
 
+# Whether setup_logging has been called, so get_logger can skip the check
+_configured = False
+
 
 class LogFormatter(logging.Formatter):
     """Custom formatter with colors for console output."""
@@ -34,13 +37,26 @@ class LogFormatter(logging.Formatter):
         "RESET": "\033[0m",      # Reset
     }
 
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the formatter.
+
+        Whether to use colors is decided once here rather than per record. Colors
+        are only used when outputting to a terminal and NO_COLOR is not set.
+        """
+        super().__init__(*args, **kwargs)
+        self._use_color = sys.stdout.isatty() and not os.environ.get("NO_COLOR")
+        reset = self.COLORS["RESET"]
+        self._wrap = {
+            level: (color, reset) for level, color in self.COLORS.items() if level != "RESET"
+        }
+
     def format(self, record):
         """Format the log record with colors for console output."""
         log_message = super().format(record)
-        if sys.stdout.isatty():  # Only use colors when outputting to a terminal
-            level_name = record.levelname
-            if level_name in self.COLORS:
-                log_message = f"{self.COLORS[level_name]}{log_message}{self.COLORS['RESET']}"
+        if self._use_color:
+            wrap = self._wrap.get(record.levelname)
+            if wrap:
+                log_message = wrap[0] + log_message + wrap[1]
         return log_message
 
 
@@ -59,9 +75,11 @@ def setup_logging(
     Returns:
         The configured logger.
     """
+    global _configured
+
     # Convert string level to int if needed
     if isinstance(level, str):
-        level = getattr(logging, level.upper(), logging.INFO)
+        level = TRACE if level.upper() == "TRACE" else getattr(logging, level.upper(), logging.INFO)
 
     # Create logger
     logger = logging.getLogger("gemini_precommit")
@@ -92,13 +110,15 @@ def setup_logging(
         file_handler.setFormatter(file_formatter)
         logger.addHandler(file_handler)
 
+    _configured = True
     return logger
 
 
 def get_logger(name: Optional[str] = None) -> logging.Logger:
     """Get a logger with the specified name.
 
-    If the logger hasn't been set up yet, it will be set up with default settings.
+    If logging hasn't been set up yet and the caller has not added handlers of
+    their own, it will be set up with default settings.
 
     Args:
         name: The name of the logger. If None, the root logger will be returned.
@@ -113,9 +133,9 @@ def get_logger(name: Optional[str] = None) -> logging.Logger:
 
     logger = logging.getLogger(logger_name)
 
-    # If the root logger doesn't have handlers, set up logging with default settings
-    root_logger = logging.getLogger("gemini_precommit")
-    if not root_logger.handlers:
+    # If logging hasn't been set up yet, set it up with default settings, unless
+    # an application using this package has already configured the logger
+    if not _configured and not logging.getLogger("gemini_precommit").handlers:
         # Get log level from environment variable or use INFO as default
         log_level = os.environ.get("GEMINI_PRECOMMIT_LOG_LEVEL", "INFO")
         
@@ -1,10 +1,78 @@
 """Utility functions for the Gemini Pre-commit Hook Generator."""
 
+import functools
 import os
+import shutil
+import stat
 import subprocess
 import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Iterator, List, Optional, Tuple, Union
+
+# Extensions of the code files that documentation is checked against. This is a
+# tuple so that file names can be matched with a single str.endswith call.
+_DOC_FRESHNESS_CODE_EXTS = (
+    ".py",
+    ".js",
+    ".ts",
+    ".java",
+    ".go",
+    ".rb",
+    ".php",
+    ".c",
+    ".cpp",
+    ".h",
+    ".hpp",
+)
+
+# Directories whose contents are not considered when checking documentation freshness
+_DOC_FRESHNESS_SKIP_DIRS = frozenset({".git", "venv", ".venv", "node_modules", "__pycache__"})
+
+# Directories, relative to the repository root, whose Markdown files are checked
+# in addition to README.md. A tuple, so they are always reported in this order.
+_DOC_DIR_NAMES = ("docs", "doc", "documentation")
+
+# Number of threads walking the top-level directories of a repository in parallel
+_DOC_FRESHNESS_WALK_WORKERS = 8
+
+# The process umask, read once at import time because reading it means briefly
+# setting it, which would race with files created by other threads
+_UMASK = os.umask(0o022)
+os.umask(_UMASK)
+
+
+@functools.lru_cache(maxsize=32)
+def _git_rev_parse(path: str) -> Tuple[bool, Optional[str]]:
+    """Query git about the repository containing the given path.
+
+    Both facts come from a single git process, and the result is cached per
+    path since callers usually ask for both.
+
+    Args:
+        path: Absolute path to query.
+
+    Returns:
+        A tuple of whether the path is inside a git work tree and the root
+        directory of that work tree, or (False, None) if it is not in one.
+    """
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--is-inside-work-tree", "--show-toplevel"],
+            cwd=path,
+            check=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+    except (subprocess.CalledProcessError, FileNotFoundError, NotADirectoryError):
+        return False, None
+
+    # The output is kept as bytes; only the top-level path needs decoding
+    lines = result.stdout.splitlines()
+    if not lines or lines[0].strip() != b"true":
+        return False, None
+    return True, os.fsdecode(lines[1].strip()) if len(lines) > 1 else None
 
 
 def is_git_repository(path: str = ".") -> bool:
@@ -16,17 +84,7 @@ def is_git_repository(path: str = ".") -> bool:
     Returns:
         True if the path is a git repository, False otherwise.
     """
-    try:
-        result = subprocess.run(
-            ["git", "rev-parse", "--is-inside-work-tree"],
-            cwd=path,
-            check=True,
-            capture_output=True,
-            text=True,
-        )
-        return result.stdout.strip() == "true"
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return False
+    return _git_rev_parse(os.path.abspath(path))[0]
 
 
 def get_git_root(path: str = ".") -> Optional[str]:
@@ -38,22 +96,16 @@ def get_git_root(path: str = ".") -> Optional[str]:
     Returns:
         The root directory of the git repository, or None if not in a git repository.
     """
-    try:
-        result = subprocess.run(
-            ["git", "rev-parse", "--show-toplevel"],
-            cwd=path,
-            check=True,
-            capture_output=True,
-            text=True,
-        )
-        return result.stdout.strip()
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return None
+    return _git_rev_parse(os.path.abspath(path))[1]
 
 
+@functools.lru_cache(maxsize=1)
 def is_pre_commit_installed() -> bool:
     """Check if pre-commit is installed.
 
+    The result is cached for the lifetime of the process; call
+    is_pre_commit_installed.cache_clear() to check again.
+
     Returns:
         True if pre-commit is installed, False otherwise.
     """
@@ -61,8 +113,8 @@ def is_pre_commit_installed() -> bool:
         subprocess.run(
             ["pre-commit", "--version"],
             check=True,
-            capture_output=True,
-            text=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
         )
         return True
     except (subprocess.CalledProcessError, FileNotFoundError):
@@ -85,10 +137,75 @@ def install_pre_commit() -> bool:
             capture_output=True,
             text=True,
         )
-        return is_pre_commit_installed()
     except (subprocess.CalledProcessError, FileNotFoundError):
         return False
 
+    # The cached "not installed" answer is stale now
+    is_pre_commit_installed.cache_clear()
+
+    # pip succeeded, so only check that the pre-commit executable can be found,
+    # which does not need another process
+    return shutil.which("pre-commit") is not None
+
+
+def get_cache_dir() -> Path:
+    """Get the directory used for on-disk caches.
+
+    Honours XDG_CACHE_HOME and falls back to ~/.cache.
+
+    Returns:
+        The path to the gemini-precommit cache directory. It may not exist yet.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "gemini-precommit"
+
+
+def is_cache_disabled() -> bool:
+    """Check if on-disk caching has been disabled.
+
+    Caching is disabled by setting the GEMINI_PRECOMMIT_NO_CACHE environment
+    variable to any non-empty value.
+
+    Returns:
+        True if caching is disabled, False otherwise.
+    """
+    return bool(os.environ.get("GEMINI_PRECOMMIT_NO_CACHE"))
+
+
+def atomic_write_text(file_path: Union[str, Path], content: str) -> None:
+    """Write text to a file atomically.
+
+    The content is written to a temporary file in the same directory, which is
+    then moved over the target, so readers never see a partially written file.
+    A symlink target is written through, replacing the file it points to. The
+    permissions of an existing target are preserved; new files get 0o666 minus
+    the umask, as with open().
+
+    Args:
+        file_path: Path to the file to write.
+        content: The text to write.
+
+    Raises:
+        OSError: If the file cannot be written.
+    """
+    file_path = Path(os.path.realpath(file_path))
+    fd, tmp_path = tempfile.mkstemp(dir=str(file_path.parent), prefix=f".{file_path.name}.")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        try:
+            mode = stat.S_IMODE(os.stat(file_path).st_mode)
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
 
 def backup_file(file_path: Union[str, Path]) -> Optional[str]:
     """Create a backup of the given file.
@@ -99,19 +216,144 @@ def backup_file(file_path: Union[str, Path]) -> Optional[str]:
     Returns:
         The path to the backup file, or None if backup failed.
     """
-    file_path = Path(file_path)
-    if not file_path.exists():
-        return None
-
     backup_path = f"{file_path}.bak"
     try:
-        import shutil
-        shutil.copy2(file_path, backup_path)
+        # copyfile uses the kernel's zero-copy paths where available, and raises
+        # FileNotFoundError for a missing file, so no existence check is needed.
+        # Only the permissions are carried over, since the backup needs no other
+        # metadata.
+        shutil.copyfile(file_path, backup_path)
+        shutil.copymode(file_path, backup_path)
         return backup_path
-    except Exception:
+    except OSError:
         return None
 
 
+def _scan_code_dir(path: str) -> Tuple[List[float], List[str]]:
+    """Scan a single directory for code files and subdirectories to descend into.
+
+    Files and directories are told apart from the os.scandir listing, and
+    directories that never contain project code are left out.
+
+    Args:
+        path: The directory to scan.
+
+    Returns:
+        A tuple of the modification times of the code files in the directory,
+        and the paths of its subdirectories to walk.
+    """
+    mtimes: List[float] = []
+    subdirs: List[str] = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in _DOC_FRESHNESS_SKIP_DIRS:
+                        subdirs.append(entry.path)
+                elif entry.name.endswith(_DOC_FRESHNESS_CODE_EXTS):
+                    try:
+                        mtimes.append(entry.stat().st_mtime)
+                    except OSError:
+                        continue
+    except OSError:
+        pass
+    return mtimes, subdirs
+
+
+def _iter_code_mtimes(root: str) -> Iterator[float]:
+    """Yield the modification times of the code files under a directory.
+
+    The tree is walked lazily, one directory at a time, so callers can stop
+    early.
+
+    Args:
+        root: The directory to walk.
+
+    Yields:
+        The modification time of each code file.
+    """
+    stack = [root]
+    while stack:
+        mtimes, subdirs = _scan_code_dir(stack.pop())
+        yield from mtimes
+        stack.extend(subdirs)
+
+
+def _newest_code_mtime_in(root: str) -> float:
+    """Get the modification time of the newest code file under a directory.
+
+    Args:
+        root: The directory to walk.
+
+    Returns:
+        The newest modification time, or 0.0 if there are no code files.
+    """
+    return max(_iter_code_mtimes(root), default=0.0)
+
+
+def _newest_code_mtime(repo_path: str) -> float:
+    """Get the modification time of the newest code file in a repository.
+
+    Each top-level directory is walked in its own thread, since the walk is
+    bound by directory reads and stat calls.
+
+    Args:
+        repo_path: Path to the repository root.
+
+    Returns:
+        The newest modification time, or 0.0 if there are no code files.
+    """
+    mtimes, subdirs = _scan_code_dir(repo_path)
+    newest = max(mtimes, default=0.0)
+    if subdirs:
+        with ThreadPoolExecutor(max_workers=_DOC_FRESHNESS_WALK_WORKERS) as executor:
+            newest = max(newest, *executor.map(_newest_code_mtime_in, subdirs))
+    return newest
+
+
+def _iter_doc_files(doc_dir: str) -> Iterator[Tuple[str, float]]:
+    """Yield the Markdown files under a documentation directory.
+
+    Args:
+        doc_dir: The documentation directory to walk.
+
+    Yields:
+        A tuple of the path and modification time of each Markdown file.
+    """
+    stack = [doc_dir]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in _DOC_FRESHNESS_SKIP_DIRS:
+                            stack.append(entry.path)
+                    elif entry.name.endswith(".md"):
+                        try:
+                            yield entry.path, entry.stat().st_mtime
+                        except OSError:
+                            continue
+        except OSError:
+            continue
+
+
+def _find_outdated_docs(doc_dir: str, newest_code_mtime: float) -> List[str]:
+    """Find the Markdown files under a documentation directory older than the code.
+
+    Args:
+        doc_dir: The documentation directory to walk.
+        newest_code_mtime: Modification time of the newest code file.
+
+    Returns:
+        The paths of the Markdown files modified before the newest code file.
+    """
+    return [
+        doc_file
+        for doc_file, doc_mtime in _iter_doc_files(doc_dir)
+        if newest_code_mtime > doc_mtime
+    ]
+
+
 def check_doc_freshness(repo_path: str = ".") -> List[str]:
     """Check if documentation files are up-to-date.
 
@@ -125,45 +367,42 @@ def check_doc_freshness(repo_path: str = ".") -> List[str]:
         A list of documentation files that need to be updated.
     """
     repo_path = Path(repo_path)
+    repo_root = str(repo_path)
+    readme_path = str(repo_path / "README.md")
     outdated_docs = []
 
-    # Check if README.md exists
-    readme_path = repo_path / "README.md"
-    if not readme_path.exists():
-        outdated_docs.append(str(readme_path))
+    # Check if README.md exists, taking its modification time from the same stat
+    try:
+        readme_mtime = os.stat(readme_path).st_mtime
+    except (FileNotFoundError, NotADirectoryError):
+        outdated_docs.append(readme_path)
         return outdated_docs
 
-    # Check README.md modification time against code files
-    readme_mtime = readme_path.stat().st_mtime
-    code_files = []
+    doc_dirs = [str(repo_path / name) for name in _DOC_DIR_NAMES]
+    doc_dirs = [doc_dir for doc_dir in doc_dirs if os.path.isdir(doc_dir)]
 
-    # Find code files
-    for ext in [".py", ".js", ".ts", ".java", ".go", ".rb", ".php", ".c", ".cpp", ".h", ".hpp"]:
-        code_files.extend(repo_path.glob(f"**/*{ext}"))
+    # If README.md is the only document, the walk can stop at the first code
+    # file newer than it
+    if not doc_dirs:
+        if any(mtime > readme_mtime for mtime in _iter_code_mtimes(repo_root)):
+            outdated_docs.append(readme_path)
+        return outdated_docs
 
-    # Filter out files in certain directories
-    code_files = [
-        f for f in code_files
-        if not any(part in f.parts for part in [".git", "venv", ".venv", "node_modules", "__pycache__"])
-    ]
+    # Only the newest code file matters when comparing against a document
+    newest_code_mtime = _newest_code_mtime(repo_root)
 
     # Check if any code file is newer than README.md
-    for code_file in code_files:
-        if code_file.stat().st_mtime > readme_mtime:
-            outdated_docs.append(str(readme_path))
-            break
-
-    # Check other documentation files
-    doc_dirs = [repo_path / "docs", repo_path / "doc", repo_path / "documentation"]
-    for doc_dir in doc_dirs:
-        if not doc_dir.exists() or not doc_dir.is_dir():
-            continue
-
-        for doc_file in doc_dir.glob("**/*.md"):
-            doc_mtime = doc_file.stat().st_mtime
-            for code_file in code_files:
-                if code_file.stat().st_mtime > doc_mtime:
-                    outdated_docs.append(str(doc_file))
-                    break
+    if newest_code_mtime > readme_mtime:
+        outdated_docs.append(readme_path)
+
+    # Check other documentation files, scanning the documentation directories in
+    # parallel when there are several
+    if len(doc_dirs) == 1:
+        outdated_docs.extend(_find_outdated_docs(doc_dirs[0], newest_code_mtime))
+    else:
+        find_docs = functools.partial(_find_outdated_docs, newest_code_mtime=newest_code_mtime)
+        with ThreadPoolExecutor(max_workers=len(doc_dirs)) as executor:
+            for docs in executor.map(find_docs, doc_dirs):
+                outdated_docs.extend(docs)
 
     return outdated_docs
@@ -0,0 +1,10 @@
+"""Shared fixtures for the test suite."""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    """Point the on-disk caches at a per-test directory instead of ~/.cache."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.delenv("GEMINI_PRECOMMIT_NO_CACHE", raising=False)
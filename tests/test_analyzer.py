@@ -1,13 +1,41 @@
 """Tests for the analyzer module."""
 
-import os
-import tempfile
+import subprocess
 from pathlib import Path
 from unittest import mock
 
 import pytest
 
 from gemini_precommit.analyzer import CodebaseAnalyzer, analyze_codebase
+from gemini_precommit.utils import get_cache_dir
+
+
+@pytest.fixture(scope="module")
+def shared_tmp(tmp_path_factory):
+    """Create a temporary directory shared by all tests in this module."""
+    return tmp_path_factory.mktemp("analyzer")
+
+
+@pytest.fixture
+def repo_dir(shared_tmp, request):
+    """Create an empty repository directory for a single test."""
+    path = shared_tmp / request.node.name
+    path.mkdir()
+    return path
+
+
+def _git(repo_dir, *args):
+    """Run a git command in a test repository."""
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=repo_dir,
+        check=True,
+    )
+
+
+def _init_git_repo(repo_dir):
+    """Turn a test directory into an empty git repository."""
+    _git(repo_dir, "init", "-q")
 
 
 def test_analyzer_initialization():
@@ -32,25 +60,90 @@ def test_analyze_codebase():
     assert "ci_workflows" in results
 
 
-def test_find_file_extensions():
+def test_analyze_codebase_uses_cache(repo_dir):
+    """Test that analyze_codebase reuses cached results for an unchanged repository."""
+    _init_git_repo(repo_dir)
+    Path(repo_dir, "file.py").touch()
+
+    first = analyze_codebase(repo_dir)
+    with mock.patch.object(CodebaseAnalyzer, "analyze") as analyze:
+        second = analyze_codebase(repo_dir)
+        analyze.assert_not_called()
+        analyze_codebase(repo_dir, use_cache=False)
+        analyze.assert_called_once()
+
+    assert second == first
+
+
+def test_analyze_codebase_cache_notices_uncommitted_changes(repo_dir):
+    """Test that unstaged edits and new files invalidate the cached analysis."""
+    _init_git_repo(repo_dir)
+    Path(repo_dir, "requirements.txt").write_text("flask\n")
+    Path(repo_dir, "src").mkdir()
+    Path(repo_dir, "src", "a.py").touch()
+    _git(repo_dir, "add", ".")
+    _git(repo_dir, "commit", "-q", "-m", "Initial commit")
+
+    first = analyze_codebase(repo_dir)
+    assert first["python_dependencies"] == ["flask"]
+
+    with open(Path(repo_dir, "requirements.txt"), "a") as f:
+        f.write("django\n")
+    Path(repo_dir, "src", "nested").mkdir()
+    Path(repo_dir, "src", "nested", "c.go").touch()
+
+    second = analyze_codebase(repo_dir)
+    assert second["python_dependencies"] == ["django", "flask"]
+    assert "go" in second["languages"]
+
+    # The out-of-date entry is overwritten rather than joined by a new one
+    assert len(list(get_cache_dir().iterdir())) == 1
+
+
+def test_analyze_codebase_does_not_cache_outside_git(repo_dir):
+    """Test that directories outside a git work tree are always analyzed afresh."""
+    Path(repo_dir, "file.py").touch()
+
+    analyze_codebase(repo_dir)
+    with mock.patch.object(CodebaseAnalyzer, "analyze") as analyze:
+        analyze_codebase(repo_dir)
+        analyze.assert_called_once()
+
+
+def test_find_file_extensions(repo_dir):
     """Test that _find_file_extensions finds file extensions."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        # Create some files with different extensions
-        Path(temp_dir, "file.py").touch()
-        Path(temp_dir, "file.js").touch()
-        Path(temp_dir, "file.md").touch()
-        
-        # Create a hidden directory that should be skipped
-        hidden_dir = Path(temp_dir, ".hidden")
-        hidden_dir.mkdir()
-        Path(hidden_dir, "hidden.py").touch()
-        
-        analyzer = CodebaseAnalyzer(temp_dir)
-        analyzer._find_file_extensions()
-        
-        assert "py" in analyzer.file_extensions
-        assert "js" in analyzer.file_extensions
-        assert "md" in analyzer.file_extensions
+    # Create some files with different extensions
+    Path(repo_dir, "file.py").touch()
+    Path(repo_dir, "file.js").touch()
+    Path(repo_dir, "file.md").touch()
+
+    # Create a hidden directory that should be skipped
+    hidden_dir = Path(repo_dir, ".hidden")
+    hidden_dir.mkdir()
+    Path(hidden_dir, "hidden.py").touch()
+
+    analyzer = CodebaseAnalyzer(repo_dir)
+    analyzer._find_file_extensions()
+
+    assert "py" in analyzer.file_extensions
+    assert "js" in analyzer.file_extensions
+    assert "md" in analyzer.file_extensions
+
+
+def test_find_file_extensions_skips_vendored_dirs(repo_dir):
+    """Test that _find_file_extensions does not descend into vendored directories."""
+    Path(repo_dir, "file.py").touch()
+
+    # Create directories whose contents should be ignored
+    for skipped in ("node_modules", "venv", ".git"):
+        skipped_dir = Path(repo_dir, skipped, "nested")
+        skipped_dir.mkdir(parents=True)
+        Path(skipped_dir, f"{skipped.strip('.')}.rb").touch()
+
+    analyzer = CodebaseAnalyzer(repo_dir)
+    analyzer._find_file_extensions()
+
+    assert analyzer.file_extensions == {"py"}
 
 
 def test_detect_languages():
@@ -58,53 +151,96 @@ def test_detect_languages():
     analyzer = CodebaseAnalyzer()
     analyzer.file_extensions = {"py", "js", "md"}
     analyzer._detect_languages()
-    
+
     assert "python" in analyzer.languages
     assert "javascript" in analyzer.languages
     assert "markdown" in analyzer.languages
 
 
-def test_find_python_dependencies_requirements_txt():
+def test_find_python_dependencies_requirements_txt(repo_dir):
     """Test that _find_python_dependencies finds dependencies in requirements.txt."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        # Create a requirements.txt file
-        with open(Path(temp_dir, "requirements.txt"), "w") as f:
-            f.write("requests==2.28.1\n")
-            f.write("# Comment line\n")
-            f.write("flask>=2.0.0\n")
-        
-        analyzer = CodebaseAnalyzer(temp_dir)
-        analyzer._find_python_dependencies()
-        
-        assert "requests" in analyzer.python_dependencies
-        assert "flask" in analyzer.python_dependencies
-
-
-def test_find_existing_configs():
+    # Create a requirements.txt file
+    with open(Path(repo_dir, "requirements.txt"), "w") as f:
+        f.write("requests==2.28.1\n")
+        f.write("# Comment line\n")
+        f.write("flask>=2.0.0\n")
+
+    analyzer = CodebaseAnalyzer(repo_dir)
+    analyzer._find_python_dependencies()
+
+    assert "requests" in analyzer.python_dependencies
+    assert "flask" in analyzer.python_dependencies
+
+
+def test_find_python_dependencies_pyproject_toml(repo_dir):
+    """Test that _find_python_dependencies finds dependencies in pyproject.toml."""
+    # Create a pyproject.toml file
+    with open(Path(repo_dir, "pyproject.toml"), "w") as f:
+        f.write("[project]\n")
+        f.write('name = "example"\n')
+        f.write('dependencies = ["Click>=8.0", "pyyaml"]\n')
+
+    analyzer = CodebaseAnalyzer(repo_dir)
+    analyzer._find_python_dependencies()
+
+    assert analyzer.python_dependencies == {"click", "pyyaml"}
+
+
+def test_find_python_dependencies_pipfile(repo_dir):
+    """Test that _find_python_dependencies finds dependencies in a Pipfile."""
+    # Create a Pipfile
+    with open(Path(repo_dir, "Pipfile"), "w") as f:
+        f.write("[packages]\n")
+        f.write('requests = "*"\n')
+        f.write('Django = {version = ">=4.0"}\n')
+        f.write("\n[dev-packages]\n")
+        f.write('pytest = "*"\n')
+
+    analyzer = CodebaseAnalyzer(repo_dir)
+    analyzer._find_python_dependencies()
+
+    assert analyzer.python_dependencies == {"requests", "django"}
+
+
+def test_find_existing_configs(repo_dir):
     """Test that _find_existing_configs finds existing configuration files."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        # Create some configuration files
-        Path(temp_dir, ".pre-commit-config.yaml").touch()
-        Path(temp_dir, ".flake8").touch()
-        
-        analyzer = CodebaseAnalyzer(temp_dir)
-        analyzer._find_existing_configs()
-        
-        assert "pre-commit" in analyzer.existing_configs
-        assert "flake8" in analyzer.existing_configs
-
-
-def test_find_ci_workflows():
+    # Create some configuration files
+    Path(repo_dir, ".pre-commit-config.yaml").touch()
+    Path(repo_dir, ".flake8").touch()
+
+    analyzer = CodebaseAnalyzer(repo_dir)
+    analyzer._find_existing_configs()
+
+    assert "pre-commit" in analyzer.existing_configs
+    assert "flake8" in analyzer.existing_configs
+
+
+def test_find_existing_configs_pyproject_tools(repo_dir):
+    """Test that _find_existing_configs detects tool sections in pyproject.toml."""
+    with open(Path(repo_dir, "pyproject.toml"), "w") as f:
+        f.write("[tool.isort]\n")
+        f.write('profile = "black"\n')
+        f.write("[tool.pylint.messages_control]\n")
+        f.write('disable = ["C0114"]\n')
+
+    analyzer = CodebaseAnalyzer(repo_dir)
+    analyzer._find_existing_configs()
+
+    assert "isort" in analyzer.existing_configs
+    assert "pylint" in analyzer.existing_configs
+    assert "mypy" not in analyzer.existing_configs
+
+
+def test_find_ci_workflows(repo_dir):
     """Test that _find_ci_workflows finds CI/CD workflow files."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        # Create GitHub Actions workflow directory and file
-        github_dir = Path(temp_dir, ".github", "workflows")
-        github_dir.mkdir(parents=True)
-        workflow_file = Path(github_dir, "ci.yml")
-        workflow_file.touch()
-        
-        analyzer = CodebaseAnalyzer(temp_dir)
-        analyzer._find_ci_workflows()
-        
-        assert len(analyzer.ci_workflows) == 1
-        assert workflow_file in analyzer.ci_workflows
+    # Create GitHub Actions workflow directory and file
+    github_dir = Path(repo_dir, ".github", "workflows")
+    github_dir.mkdir(parents=True)
+    workflow_file = Path(github_dir, "ci.yml")
+    workflow_file.touch()
+
+    analyzer = CodebaseAnalyzer(repo_dir)
+    analyzer._find_ci_workflows()
+
+    assert len(analyzer.ci_workflows) == 1
+    assert workflow_file in analyzer.ci_workflows
@@ -0,0 +1,208 @@
+"""Tests for the gemini_client module."""
+
+import os
+import time
+from unittest import mock
+
+import pytest
+from google.api_core import exceptions as google_exceptions
+
+from gemini_precommit import gemini_client
+from gemini_precommit.gemini_client import GeminiClient, get_gemini_client
+from gemini_precommit.utils import get_cache_dir
+
+
+@pytest.fixture
+def client():
+    """Create a Gemini client with a dummy API key."""
+    return GeminiClient(api_key="test-api-key")
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        "repos:\n  - repo: local\n",
+        "```yaml\nrepos:\n  - repo: local\n```",
+        "```\nrepos:\n  - repo: local\n```\n",
+        "  ```yaml\nrepos:\n  - repo: local\n",
+    ],
+)
+def test_parse_response_strips_code_fences(client, response):
+    """Test that _parse_response extracts the YAML content from code blocks."""
+    result = client._parse_response(response)
+    assert result["yaml_content"] == "repos:\n  - repo: local"
+
+
+def test_call_gemini_api_retries_transient_errors(client):
+    """Test that _call_gemini_api retries rate-limit errors with backoff."""
+    client.model = mock.Mock()
+    client.model.generate_content.side_effect = [
+        google_exceptions.ResourceExhausted("quota exceeded"),
+        google_exceptions.ServiceUnavailable("unavailable"),
+        [mock.Mock(text="repos:"), mock.Mock(text=" []")],
+    ]
+
+    with mock.patch("gemini_precommit.gemini_client.time.sleep") as sleep:
+        assert client._call_gemini_api("prompt") == "repos: []"
+
+    assert client.model.generate_content.call_count == 3
+    assert sleep.call_count == 2
+
+
+def test_call_gemini_api_gives_up_after_max_retries(client):
+    """Test that _call_gemini_api raises once retries are exhausted."""
+    client.max_retries = 2
+    client.model = mock.Mock()
+    client.model.generate_content.side_effect = google_exceptions.ResourceExhausted("quota")
+
+    with mock.patch("gemini_precommit.gemini_client.time.sleep") as sleep:
+        with pytest.raises(Exception, match="Failed to call Gemini API"):
+            client._call_gemini_api("prompt")
+
+    assert client.model.generate_content.call_count == 3
+    assert sleep.call_count == 2
+
+
+def test_call_gemini_api_does_not_retry_permanent_errors(client):
+    """Test that _call_gemini_api fails immediately on non-transient errors."""
+    client.model = mock.Mock()
+    client.model.generate_content.side_effect = google_exceptions.InvalidArgument("bad request")
+
+    with mock.patch("gemini_precommit.gemini_client.time.sleep") as sleep:
+        with pytest.raises(Exception, match="bad request"):
+            client._call_gemini_api("prompt")
+
+    assert client.model.generate_content.call_count == 1
+    sleep.assert_not_called()
+
+
+def test_generate_precommit_config_caches_responses(client):
+    """Test that identical prompts are answered from the on-disk cache."""
+    client.model = mock.Mock()
+    client.model.generate_content.return_value = [mock.Mock(text="repos: []")]
+    analysis_results = {"file_extensions": ["py"], "languages": ["python"]}
+
+    first = client.generate_precommit_config(analysis_results)
+    second = client.generate_precommit_config(analysis_results)
+
+    assert client.model.generate_content.call_count == 1
+    assert second["yaml_content"] == first["yaml_content"] == "repos: []"
+
+
+def test_generate_precommit_config_refreshes_expired_responses(client):
+    """Test that cached responses older than the TTL are removed and fetched again."""
+    client.model = mock.Mock()
+    client.model.generate_content.return_value = [mock.Mock(text="repos: []")]
+    analysis_results = {"file_extensions": ["py"], "languages": ["python"]}
+
+    client.generate_precommit_config(analysis_results)
+    (cache_file,) = get_cache_dir().iterdir()
+    expired = time.time() + client.cache_ttl_seconds + 1
+    with mock.patch("gemini_precommit.gemini_client.time.time", return_value=expired):
+        assert client._cache_get(cache_file.stem) is None
+        assert not cache_file.exists()
+        client.generate_precommit_config(analysis_results)
+
+    assert client.model.generate_content.call_count == 2
+
+
+def test_cache_put_prunes_expired_responses(client):
+    """Test that caching a response removes other responses older than the TTL."""
+    cache_dir = get_cache_dir()
+    cache_dir.mkdir(parents=True)
+    stale = cache_dir / "stale.yaml"
+    stale.write_text("repos: []")
+    expired = time.time() - client.cache_ttl_seconds - 1
+    os.utime(stale, (expired, expired))
+
+    client._cache_put("fresh", "repos: [a]")
+
+    assert [p.name for p in cache_dir.iterdir()] == ["fresh.yaml"]
+
+
+def test_parse_response_omits_identical_raw_response(client):
+    """Test that the raw response is only kept when it differs from the YAML."""
+    assert "raw_response" not in client._parse_response("repos: []", include_raw=True)
+    result = client._parse_response("```yaml\nrepos: []\n```", include_raw=True)
+    assert result["raw_response"].startswith("```")
+
+
+def test_parse_response_omits_raw_response_by_default(client):
+    """Test that the raw response is not kept unless requested or debugging."""
+    with mock.patch.object(gemini_client.logger, "isEnabledFor", return_value=False):
+        assert "raw_response" not in client._parse_response("```yaml\nrepos: []\n```")
+
+
+def test_create_prompt_bounds_large_analysis_results(client):
+    """Test that _create_prompt truncates oversized analysis results."""
+    analysis_results = {
+        "file_extensions": [f"ext{i}" for i in range(60)],
+        "python_dependencies": [f"pkg{i}" for i in range(25)],
+        "existing_configs": {f"tool{i}": "x" * 100 for i in range(100)},
+    }
+
+    prompt = client._create_prompt(analysis_results)
+
+    assert "ext49, ext50" not in prompt
+    assert "ext49 (+10 more)" in prompt
+    assert "pkg19 (+5 more)" in prompt
+    assert "tool99" not in prompt
+
+
+def test_get_gemini_client_reuses_clients_per_api_key(monkeypatch):
+    """Test that get_gemini_client returns one shared client per API key."""
+    monkeypatch.setattr(gemini_client, "_CLIENT_CACHE", {})
+
+    first = get_gemini_client("key-1")
+
+    assert get_gemini_client("key-1") is first
+    assert get_gemini_client("key-2") is not first
+
+
+def test_generate_precommit_config_skips_api_for_empty_analysis(client):
+    """Test that an empty analysis yields a minimal config without calling the API."""
+    client.model = mock.Mock()
+
+    result = client.generate_precommit_config({"file_extensions": [], "languages": []})
+
+    client.model.generate_content.assert_not_called()
+    assert "trailing-whitespace" in result["yaml_content"]
+
+
+def test_generate_precommit_configs_batch_splits_documents(client):
+    """Test that a batch response is split into one configuration per repository."""
+    client.model = mock.Mock()
+    client.model.generate_content.return_value = [
+        mock.Mock(text="```yaml\nrepos: [a]\n---\nrepos: [b]\n```")
+    ]
+    analyses = [
+        {"file_extensions": ["py"], "languages": ["python"]},
+        {"file_extensions": [], "languages": []},
+        {"file_extensions": ["js"], "languages": ["javascript"]},
+    ]
+
+    results = client.generate_precommit_configs_batch(analyses, ["one", "two", "three"])
+
+    assert client.model.generate_content.call_count == 1
+    prompt = client.model.generate_content.call_args[0][0]
+    assert '<repo name="one">' in prompt and '<repo name="two">' not in prompt
+    assert [r["yaml_content"] for r in results] == [
+        "repos: [a]",
+        gemini_client._MINIMAL_CONFIG,
+        "repos: [b]",
+    ]
+
+
+def test_generate_precommit_configs_batch_rejects_missing_documents(client):
+    """Test that a batch response with the wrong number of documents is rejected."""
+    client.model = mock.Mock()
+    client.model.generate_content.return_value = [mock.Mock(text="repos: [a]")]
+    analyses = [{"languages": ["python"]}, {"languages": ["javascript"]}]
+
+    with pytest.raises(ValueError, match="Expected 2 configurations"):
+        client.generate_precommit_configs_batch(analyses)
+    with pytest.raises(ValueError):
+        client.generate_precommit_configs_batch(analyses)
+
+    # The malformed response is not cached
+    assert client.model.generate_content.call_count == 2
@@ -0,0 +1,125 @@
+"""Tests for the generator module."""
+
+import os
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from gemini_precommit.gemini_client import GeminiClient
+from gemini_precommit.generator import PrecommitGenerator, generate_hooks_batch
+
+
+@pytest.fixture
+def client():
+    """Create a Gemini client with a dummy API key and a mocked model."""
+    client = GeminiClient(api_key="test-api-key")
+    client.model = mock.Mock()
+    return client
+
+
+@pytest.fixture
+def generator(tmp_path):
+    """Create a non-interactive generator with a configuration ready to apply."""
+    generator = PrecommitGenerator(str(tmp_path), non_interactive=True)
+    generator.generated_config = {"yaml_content": "repos: []\n"}
+    return generator
+
+
+def test_apply_config_skips_unchanged_config(generator):
+    """Test that a configuration with the generated content is not rewritten."""
+    generator.config_path.write_text("repos: []\n")
+    os.utime(generator.config_path, (1000, 1000))
+
+    assert generator.apply_config()
+
+    assert generator.config_path.stat().st_mtime == 1000
+
+
+def test_apply_config_replaces_unreadable_config(generator):
+    """Test that an existing configuration that cannot be decoded is replaced."""
+    generator.config_path.write_bytes(b"\xff\xfe")
+
+    assert generator._read_existing_config() == ""
+    assert generator.apply_config()
+
+    assert generator.config_path.read_text() == "repos: []\n"
+
+
+def test_apply_config_keeps_original_on_failed_write(generator, tmp_path):
+    """Test that a failed write leaves the existing configuration intact."""
+    generator.config_path.write_text("repos: [old]\n")
+
+    with mock.patch("gemini_precommit.utils.os.replace", side_effect=OSError("disk full")):
+        assert not generator.apply_config()
+
+    assert generator.config_path.read_text() == "repos: [old]\n"
+    # The temporary file the content was written to has been removed
+    assert not list(tmp_path.glob(".pre-commit-config.yaml.*"))
+
+
+def _mock_popen(lines, returncode):
+    """Create a mock subprocess.Popen whose process prints lines and exits."""
+    process = mock.MagicMock(stdout=iter(lines), returncode=returncode)
+    popen = mock.MagicMock()
+    popen.return_value.__enter__.return_value = process
+    return popen
+
+
+def test_install_hooks_streams_output(generator, capsys):
+    """Test that the output of a successful installation is passed through."""
+    popen = _mock_popen(["installed\n"], 0)
+    with mock.patch("gemini_precommit.generator.subprocess.Popen", popen):
+        assert generator._install_hooks()
+
+    assert popen.call_args[0][0] == ["pre-commit", "install"]
+    assert "installed\n" in capsys.readouterr().out
+
+
+def test_install_hooks_reports_output_tail_on_failure(generator, capsys):
+    """Test that a failed installation reports the last lines of its output."""
+    lines = [f"line {i}\n" for i in range(25)]
+    with mock.patch("gemini_precommit.generator.subprocess.Popen", _mock_popen(lines, 1)):
+        assert not generator._install_hooks()
+
+    last_printed = capsys.readouterr().out.split("Failed to install hooks: ")[-1]
+    assert last_printed == "".join(lines[5:]).rstrip() + "\n"
+
+
+def test_install_hooks_without_pre_commit(generator):
+    """Test that a missing pre-commit executable is reported as a failure."""
+    popen = mock.Mock(side_effect=FileNotFoundError("pre-commit"))
+    with mock.patch("gemini_precommit.generator.subprocess.Popen", popen):
+        assert not generator._install_hooks()
+
+
+def test_generate_hooks_batch_falls_back_to_one_call_per_repository(client, tmp_path):
+    """Test that a batch response with too few documents is retried per repository."""
+    repo_paths = []
+    for parent, file_name in [("one", "main.py"), ("two", "main.js")]:
+        # Both repositories are called "app"
+        repo_path = tmp_path / parent / "app"
+        repo_path.mkdir(parents=True)
+        (repo_path / file_name).touch()
+        repo_paths.append(str(repo_path))
+
+    def generate_content(prompt, stream):
+        if "<repo" in prompt:
+            return [mock.Mock(text="repos: [batch]")]
+        language = "javascript" if "languages: javascript" in prompt else "python"
+        return [mock.Mock(text=f"repos: [{language}]")]
+
+    client.model.generate_content.side_effect = generate_content
+    with mock.patch("gemini_precommit.generator.get_gemini_client", return_value=client):
+        results = generate_hooks_batch(repo_paths, non_interactive=True)
+
+    batch_prompt = client.model.generate_content.call_args_list[0][0][0]
+    assert '<repo name="1-app">' in batch_prompt and '<repo name="2-app">' in batch_prompt
+    assert client.model.generate_content.call_count == 3
+    assert [r["config"]["yaml_content"] for r in results] == [
+        "repos: [python]",
+        "repos: [javascript]",
+    ]
+    assert all(r["success"] for r in results)
+    contents = [Path(path, ".pre-commit-config.yaml").read_text() for path in repo_paths]
+    assert contents == ["repos: [python]", "repos: [javascript]"]
@@ -0,0 +1,85 @@
+"""Tests for the logging module."""
+
+import logging
+
+import pytest
+
+from gemini_precommit import logging as gp_logging
+from gemini_precommit.logging import TRACE, LogFormatter, get_logger, setup_logging
+
+
+@pytest.fixture(autouse=True)
+def restore_logger(monkeypatch):
+    """Restore the package logger and its setup state after each test."""
+    logger = logging.getLogger("gemini_precommit")
+    handlers, level = logger.handlers[:], logger.level
+    monkeypatch.setattr(gp_logging, "_configured", False)
+    logger.handlers = []
+    yield logger
+    logger.handlers = handlers
+    logger.setLevel(level)
+
+
+def test_get_logger_keeps_caller_handlers(restore_logger):
+    """Test that get_logger does not replace handlers added by an application."""
+    handler = logging.NullHandler()
+    restore_logger.addHandler(handler)
+
+    get_logger("analyzer")
+
+    assert restore_logger.handlers == [handler]
+
+
+def test_get_logger_sets_up_default_logging(restore_logger):
+    """Test that get_logger sets up logging when nothing else has."""
+    get_logger("analyzer")
+
+    assert len(restore_logger.handlers) == 1
+
+
+def test_get_logger_keeps_quiet_setup(restore_logger):
+    """Test that get_logger does not add a console handler after --quiet."""
+    setup_logging(log_to_console=False)
+
+    get_logger("analyzer")
+
+    assert restore_logger.handlers == []
+
+
+@pytest.mark.parametrize("level", ["TRACE", "trace"])
+def test_setup_logging_maps_trace_level(restore_logger, level):
+    """Test that the TRACE level name maps to the custom TRACE level."""
+    assert setup_logging(level=level, log_to_console=False).level == TRACE
+
+
+class _Stream:
+    """A stand-in for sys.stdout that reports whether it is a terminal."""
+
+    def __init__(self, tty):
+        self._tty = tty
+
+    def isatty(self):
+        return self._tty
+
+
+def _format_warning():
+    """Format a warning record with a new LogFormatter."""
+    record = logging.LogRecord("gemini_precommit", logging.WARNING, __file__, 1, "hi", (), None)
+    return LogFormatter("%(message)s").format(record)
+
+
+@pytest.mark.parametrize("tty, no_color", [(True, None), (True, "1"), (False, None)])
+def test_log_formatter_colors_only_terminals(monkeypatch, tty, no_color):
+    """Test that colors are only used on a terminal when NO_COLOR is not set."""
+    monkeypatch.setattr(gp_logging.sys, "stdout", _Stream(tty))
+    if no_color is None:
+        monkeypatch.delenv("NO_COLOR", raising=False)
+    else:
+        monkeypatch.setenv("NO_COLOR", no_color)
+
+    message = _format_warning()
+
+    if tty and no_color is None:
+        assert message == "\033[33mhi\033[0m"
+    else:
+        assert message == "hi"
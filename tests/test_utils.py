@@ -0,0 +1,174 @@
+"""Tests for the utils module."""
+
+import os
+import stat
+import subprocess
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from gemini_precommit import utils
+from gemini_precommit.utils import (
+    atomic_write_text,
+    backup_file,
+    check_doc_freshness,
+    get_git_root,
+    is_git_repository,
+    is_pre_commit_installed,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Clear the cached git and pre-commit lookups around each test."""
+    utils._git_rev_parse.cache_clear()
+    utils.is_pre_commit_installed.cache_clear()
+    yield
+    utils._git_rev_parse.cache_clear()
+    utils.is_pre_commit_installed.cache_clear()
+
+
+def test_git_lookups_share_one_git_call(tmp_path):
+    """Test that is_git_repository and get_git_root reuse a single git call."""
+    completed = subprocess.CompletedProcess([], 0, stdout=b"true\n/repo\n")
+    with mock.patch("gemini_precommit.utils.subprocess.run", return_value=completed) as run:
+        assert is_git_repository(str(tmp_path))
+        assert get_git_root(str(tmp_path)) == "/repo"
+
+    run.assert_called_once()
+
+
+def test_git_lookups_outside_repository(tmp_path):
+    """Test that paths outside a git repository are reported as such."""
+    error = subprocess.CalledProcessError(128, ["git"])
+    with mock.patch("gemini_precommit.utils.subprocess.run", side_effect=error):
+        assert not is_git_repository(str(tmp_path))
+        assert get_git_root(str(tmp_path)) is None
+
+
+def test_check_doc_freshness(tmp_path):
+    """Test that documentation older than the code is reported."""
+    readme = tmp_path / "README.md"
+    readme.touch()
+    guide = tmp_path / "docs" / "guide.md"
+    guide.parent.mkdir()
+    guide.touch()
+    old_guide = tmp_path / "docs" / "old" / "guide.md"
+    old_guide.parent.mkdir()
+    old_guide.touch()
+    os.utime(readme, (1000, 1000))
+    os.utime(guide, (3000, 3000))
+    os.utime(old_guide, (1500, 1500))
+
+    code = tmp_path / "src" / "main.py"
+    code.parent.mkdir()
+    code.touch()
+    os.utime(code, (2000, 2000))
+
+    assert check_doc_freshness(str(tmp_path)) == [str(readme), str(old_guide)]
+
+
+def test_check_doc_freshness_ignores_skipped_dirs(tmp_path):
+    """Test that code in vendored directories does not make documentation stale."""
+    readme = tmp_path / "README.md"
+    readme.touch()
+    os.utime(readme, (1000, 1000))
+
+    vendored = tmp_path / "node_modules" / "pkg" / "index.js"
+    vendored.parent.mkdir(parents=True)
+    vendored.touch()
+
+    assert check_doc_freshness(str(tmp_path)) == []
+
+
+def test_check_doc_freshness_stops_at_first_newer_file(tmp_path, monkeypatch):
+    """Test that the walk stops early when README.md is the only document."""
+    readme = tmp_path / "README.md"
+    readme.touch()
+    os.utime(readme, (1000, 1000))
+
+    def code_mtimes(root):
+        yield 2000.0
+        raise AssertionError("walked past the first newer file")
+
+    monkeypatch.setattr(utils, "_iter_code_mtimes", code_mtimes)
+
+    assert check_doc_freshness(str(tmp_path)) == [str(readme)]
+
+
+def test_backup_file(tmp_path):
+    """Test that backup_file copies the file next to the original."""
+    original = tmp_path / ".pre-commit-config.yaml"
+    original.write_text("repos: []\n")
+    original.chmod(0o600)
+
+    backup = backup_file(original)
+
+    assert backup == f"{original}.bak"
+    assert Path(backup).read_text() == "repos: []\n"
+    assert stat.S_IMODE(os.stat(backup).st_mode) == 0o600
+    assert backup_file(tmp_path / "missing.yaml") is None
+
+
+def test_atomic_write_text(tmp_path):
+    """Test that atomic_write_text writes through symlinks and honours the umask."""
+    target = tmp_path / "config.yaml"
+    link = tmp_path / "link.yaml"
+    link.symlink_to(target)
+
+    atomic_write_text(link, "repos: []\n")
+
+    assert link.is_symlink()
+    assert target.read_text() == "repos: []\n"
+    assert stat.S_IMODE(os.stat(target).st_mode) == 0o666 & ~utils._UMASK
+
+    target.chmod(0o600)
+    atomic_write_text(target, "repos: [a]\n")
+    assert target.read_text() == "repos: [a]\n"
+    assert stat.S_IMODE(os.stat(target).st_mode) == 0o600
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["config.yaml", "link.yaml"]
+
+
+def test_is_pre_commit_installed_is_cached():
+    """Test that pre-commit is only looked up once per process."""
+    completed = subprocess.CompletedProcess([], 0)
+    with mock.patch("gemini_precommit.utils.subprocess.run", return_value=completed) as run:
+        assert is_pre_commit_installed()
+        assert is_pre_commit_installed()
+
+    run.assert_called_once()
+
+
+def test_check_doc_freshness_multiple_doc_dirs(tmp_path):
+    """Test that every documentation directory is checked, in a stable order."""
+    readme = tmp_path / "README.md"
+    readme.touch()
+    code = tmp_path / "main.py"
+    code.touch()
+    os.utime(readme, (3000, 3000))
+    os.utime(code, (2000, 2000))
+
+    stale = []
+    for name in ("docs", "doc", "documentation"):
+        doc = tmp_path / name / "index.md"
+        doc.parent.mkdir()
+        doc.touch()
+        os.utime(doc, (1000, 1000))
+        stale.append(str(doc))
+
+    assert check_doc_freshness(str(tmp_path)) == stale
+
+
+def test_check_doc_freshness_clean_git_tree(tmp_path):
+    """Test that a stale document committed on a clean git tree is reported."""
+    readme = tmp_path / "README.md"
+    readme.touch()
+    (tmp_path / "main.py").touch()
+    os.utime(readme, (1000, 1000))
+    git = ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"]
+    subprocess.run(git + ["init", "-q"], cwd=tmp_path, check=True)
+    subprocess.run(git + ["add", "."], cwd=tmp_path, check=True)
+    subprocess.run(git + ["commit", "-q", "-m", "Initial commit"], cwd=tmp_path, check=True)
+
+    assert check_doc_freshness(str(tmp_path)) == [str(readme)]